@@ -0,0 +1,113 @@
+"""
+FOW 페이지 파싱 벤치마크: selectolax 단일 파서 vs 기존 BeautifulSoup(html.parser) 경로
+
+    python -m bench.bench_fow [반복 횟수]
+
+fixtures/fow_*.html 은 fow.lol 마크업 구조(룬/아이템/스킬 블록)를 본뜬 합성 페이지
+fixtures/fow_*.expected.json 과 결과가 다르면 실패
+beautifulsoup4 가 설치되어 있지 않으면 기존 경로는 건너뜀
+"""
+import glob
+import json
+import os
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+from utils.docs.fow import parse_fow
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def legacy_parse_fow(html: str):
+    # 비교용: 교체 전 utils/docs/fow.py 의 파싱 방식 (div 전체 순회 + tipsy 마다 새 soup)
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    runes = {"primary": [], "secondary": [], "shard": []}
+    limits = (("width: 116px", "primary", 4), ("width: 100px", "secondary", 3), ("width: 68px", "shard", 2))
+    item_build = []
+    for div in soup.find_all("div"):
+        style = div.get("style", "")
+        for marker, key, limit in limits:
+            if marker in style:
+                if len(runes[key]) < limit:
+                    for img in div.select("img.antiBorder"):
+                        span = BeautifulSoup(img.get("tipsy", ""), "html.parser").find("span")
+                        if span:
+                            runes[key].append(span.get_text(strip=True).strip("<> "))
+                break
+        else:
+            if "width:128px" in style:
+                title_span = div.find("span", class_="summary_title")
+                if title_span and "아이템 빌드" in title_span.get_text():
+                    for img in div.select("div.content_full img.tipsy_live.item_icon"):
+                        item_name = img.get("alt", "").strip()
+                        if item_name and len(item_build) < 3:
+                            item_build.append(item_name)
+
+    skill_order = []
+    for table in soup.find_all("table", style=lambda s: s and "width:250px" in s):
+        if not skill_order:
+            for tr in table.find_all("tr"):
+                tds = tr.find_all("td")
+                if len(tds) < 2:
+                    continue
+                cells = [td for td in tds[2:] if "rskill_build" in td.get("class", [])]
+                skill_order.extend([tds[1].get_text(strip=True)] * len(cells))
+    ordered = [s for s, _ in Counter(s for s in skill_order if s != "R").most_common()]
+    ordered += [s for s in ("Q", "W", "E") if s not in ordered]
+    return {"runes": runes, "build": item_build, "skill_order": ordered}
+
+
+def measure(fn, html: str, rounds: int) -> dict:
+    fn(html)
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    for _ in range(rounds):
+        fn(html)
+    wall = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+
+    # selectolax 트리는 C 메모리라 tracemalloc 에는 Python 쪽 할당만 잡힘
+    tracemalloc.start()
+    result = fn(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {
+        "wall_ms_per_page": round(wall / rounds * 1e3, 3),
+        "cpu_ms_per_page": round(cpu / rounds * 1e3, 3),
+        "peak_alloc_kib_per_page": round(peak / 1024, 1),
+    }
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    try:
+        import bs4  # noqa: F401
+        parsers = (("selectolax", parse_fow), ("bs4_legacy", legacy_parse_fow))
+    except ImportError:
+        parsers = (("selectolax", parse_fow),)
+
+    results = {"rounds": rounds, "pages": {}}
+    for path in sorted(glob.glob(os.path.join(FIXTURES, "fow_*.html"))):
+        name = os.path.basename(path)[:-len(".html")]
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        with open(os.path.join(FIXTURES, f"{name}.expected.json"), encoding="utf-8") as f:
+            expected = json.load(f)
+
+        page = {"bytes": len(html.encode())}
+        for parser_name, fn in parsers:
+            assert fn(html) == expected, f"{parser_name} output differs for {name}"
+            page[parser_name] = measure(fn, html, rounds)
+        if "bs4_legacy" in page:
+            page["cpu_speedup"] = round(page["bs4_legacy"]["cpu_ms_per_page"] / page["selectolax"]["cpu_ms_per_page"], 1)
+        results["pages"][name] = page
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""
+오프라인 부하 벤치마크: 스텁 업스트림 + 앱(uvicorn)을 띄우고 동시성 단계별로 요청
+
+    python -m bench.bench_load --levels 1,8,32 --duration 10 --latency-ms 30 --rate-429 0.01
+
+- 시나리오: account / league / match (/match/detail/all) / rag
+- 시나리오 × 동시성마다 p50/p95/p99 지연, 초당 처리량, 오류 수, 앱 프로세스 RSS 기록
+- 결과는 커밋별로 비교할 수 있도록 JSON 파일로 저장 (기본 bench/results/load-<commit>.json)
+- 앱은 매 실행마다 임시 디렉터리의 저장소/캐시로 시작 (각 시나리오는 이전 단계가 채운 캐시를 그대로 사용)
+- /rag 임베딩: --embedder stub (기본) 은 bench/stub_app.py 의 해시 임베딩으로 오프라인 실행,
+  --embedder model 은 Chroma 기본 모델(ONNX)을 사용 (로컬에 받아져 있지 않으면 rag 시나리오를 건너뛰고 skipped 에 기록)
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIOS = ("account", "league", "match", "rag")
+RAG_CHAMPIONS = ("Ahri", "Zed", "Lux", "Yasuo", "Jinx")
+RAG_QUESTIONS = ("룬 추천", "아이템 빌드", "스킬 선마 순서", "Charm combo", "Orb of Deception damage")
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def git_commit() -> dict:
+    def run(*args):
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    return {"commit": run("rev-parse", "HEAD"), "dirty": bool(run("status", "--porcelain", "--untracked-files=no"))}
+
+
+def read_rss(pid: int) -> dict:
+    # Linux /proc 기준 (다른 OS 는 None)
+    result = {"rss_mib": None, "peak_rss_mib": None}
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    result["rss_mib"] = round(int(line.split()[1]) / 1024, 1)
+                elif line.startswith("VmHWM:"):
+                    result["peak_rss_mib"] = round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return result
+
+
+def percentile(sorted_values: list[float], q: float) -> float | None:
+    # nearest-rank: q% 이상의 값이 이 값 이하가 되는 가장 작은 순위
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return round(sorted_values[index] * 1000, 2)
+
+
+def wait_ready(url: str, proc: subprocess.Popen, timeout: float = 60.0):
+    started = time.perf_counter()
+    with httpx.Client(timeout=1.0) as client:
+        while time.perf_counter() - started < timeout:
+            try:
+                if client.get(url).status_code < 500:
+                    return
+            except httpx.TransportError:
+                pass
+            if proc.poll() is not None:
+                raise RuntimeError(f"{url} server exited with {proc.returncode}")
+            time.sleep(0.05)
+    raise TimeoutError(f"{url} did not become ready")
+
+
+def request_for(scenario: str, players: int) -> tuple[str, str, dict | None]:
+    name = f"player{random.randrange(players)}"
+    if scenario == "account":
+        return "GET", f"/account/{name}/KR1", None
+    if scenario == "league":
+        return "GET", f"/league/{name}/KR1", None
+    if scenario == "match":
+        return "GET", f"/match/detail/all/{name}/KR1?limit=3", None
+    return "POST", "/rag", {"champion": random.choice(RAG_CHAMPIONS), "question": random.choice(RAG_QUESTIONS)}
+
+
+async def run_level(base_url: str, scenario: str, concurrency: int, duration: float, players: int) -> dict:
+    latencies: list[float] = []
+    statuses: dict[str, int] = {}
+    deadline = time.perf_counter() + duration
+
+    async def worker(client: httpx.AsyncClient):
+        while time.perf_counter() < deadline:
+            method, path, body = request_for(scenario, players)
+            started = time.perf_counter()
+            try:
+                resp = await client.request(method, path, json=body)
+                key = str(resp.status_code)
+            except httpx.HTTPError as e:
+                key = type(e).__name__
+            elapsed = time.perf_counter() - started
+            statuses[key] = statuses.get(key, 0) + 1
+            if key == "200":
+                latencies.append(elapsed)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*[worker(client) for _ in range(concurrency)])
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    total = sum(statuses.values())
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "requests": total,
+        "ok": len(latencies),
+        "errors": total - len(latencies),
+        "statuses": statuses,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+def skip_scenarios(scenarios, embedder: str) -> dict:
+    """
+    실행할 수 없는 시나리오 -> 이유 (결과 파일의 skipped)
+    """
+    from bench.stub_app import model_available
+
+    if "rag" in scenarios and embedder == "model" and not model_available():
+        print("skip rag: Chroma embedding model is not downloaded (use --embedder stub)", file=sys.stderr)
+        return {"rag": "embedding model not downloaded"}
+    return {}
+
+
+def start_servers(args, tmp: str) -> tuple[subprocess.Popen, subprocess.Popen, str, str]:
+    stub_port, app_port = free_port(), free_port()
+    stub = subprocess.Popen(
+        [sys.executable, "-m", "bench.stub_server", "--port", str(stub_port),
+         "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+         "--rate-429", str(args.rate_429), "--retry-after", str(args.retry_after)],
+        cwd=ROOT,
+    )
+    stub_url = f"http://127.0.0.1:{stub_port}"
+    wait_ready(f"{stub_url}/stub/stats", stub)
+
+    env = {
+        **os.environ,
+        "RIOT_API_KEY": "bench",
+        "RIOT_BASE_URL_TEMPLATE": f"{stub_url}/riot/{{region}}",
+        "DDRAGON_CDN": f"{stub_url}/ddragon",
+        "FOW_BASE_URL": f"{stub_url}/fow",
+        "SEARCH_URL": f"{stub_url}/search",
+        "RIOT_APP_RATE_LIMIT": "100000:1,6000000:120",
+        "CHROMA_PERSIST": os.path.join(tmp, "chroma_db"),
+        "EMBED_CACHE_PATH": os.path.join(tmp, "embed_cache.sqlite3"),
+        "MATCH_STORE_PATH": os.path.join(tmp, "match_store.sqlite3"),
+        "DDRAGON_CACHE_DIR": os.path.join(tmp, "ddragon_cache"),
+        "DDRAGON_PREWARM": "0",
+    }
+    # stub: 모델 다운로드 없이 해시 임베딩으로 실행 (bench/stub_app.py)
+    launcher = ["bench.stub_app"] if args.embedder == "stub" else ["uvicorn", "main:app"]
+    app = subprocess.Popen(
+        [sys.executable, "-m", *launcher, "--host", "127.0.0.1", "--port", str(app_port),
+         "--log-level", "warning", "--no-access-log"],
+        cwd=ROOT, env=env,
+    )
+    app_url = f"http://127.0.0.1:{app_port}"
+    wait_ready(f"{app_url}/stats/riot", app)
+    return stub, app, stub_url, app_url
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--levels", default="1,8,32", help="동시성 단계 (쉼표 구분)")
+    parser.add_argument("--duration", type=float, default=10.0, help="단계별 실행 시간 (초)")
+    parser.add_argument("--players", type=int, default=200, help="요청에 쓰는 서로 다른 Riot ID 수")
+    parser.add_argument("--latency-ms", type=float, default=30.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--embedder", choices=("stub", "model"), default="stub",
+                        help="/rag 임베딩: stub (해시, 오프라인) / model (Chroma 기본 ONNX 모델)")
+    parser.add_argument("--seed", type=int, default=22)
+    parser.add_argument("--out", default=None, help="결과 JSON 경로 (기본 bench/results/load-<commit>.json)")
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    scenarios = [s for s in args.scenarios.split(",") if s]
+    levels = [int(level) for level in args.levels.split(",") if level]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    skipped = skip_scenarios(scenarios, args.embedder)
+    scenarios = [s for s in scenarios if s not in skipped]
+
+    git = git_commit()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        stub, app, stub_url, app_url = start_servers(args, tmp)
+        try:
+            for scenario in scenarios:
+                for level in levels:
+                    result = asyncio.run(run_level(app_url, scenario, level, args.duration, args.players))
+                    result.update(read_rss(app.pid))
+                    results.append(result)
+                    print(json.dumps(result, ensure_ascii=False), flush=True)
+            upstream = httpx.get(f"{stub_url}/stub/stats").json()
+        finally:
+            for proc in (app, stub):
+                proc.terminate()
+                proc.wait()
+
+    report = {
+        **git,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "config": {k: v for k, v in vars(args).items() if k != "out"},
+        "upstream": upstream,
+        "skipped": skipped,
+        "results": results,
+    }
+    out = args.out or os.path.join(ROOT, "bench", "results", f"load-{git['commit'][:12] or 'unknown'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+MCP(/mcp, streamable HTTP) 부하 벤치마크: 같은 요청을 REST route 와 MCP 툴 호출로 보내서 비교
+
+    python -m bench.bench_mcp --sessions 1,8,32 --duration 10 --latency-ms 30
+
+- 스텁 업스트림 + 앱은 bench_load 와 같은 방식으로 띄움
+- 시나리오: account(get_account_riot_id) / match(get_match_detail_all) / rag
+- 세션 수 단계마다
+  - 먼저 시나리오에서 쓰는 요청(Riot ID / 챔피언·질문 조합)을 전부 한 번씩 보내 업스트림 캐시를 채움
+    (REST 와 MCP 가 같은 캐시 상태에서 시작하도록)
+  - rest: 세션 수만큼의 동시 작업이 REST route 호출
+  - mcp: 세션 수만큼 MCP 세션을 열고(initialize) 각 세션이 툴을 순차 호출
+  - 호출당 MCP 계층 오버헤드 = mcp p50/p95 - rest p50/p95
+- 결과는 bench/results/mcp-<commit>.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+import httpx
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+from bench.bench_load import ROOT, RAG_CHAMPIONS, RAG_QUESTIONS, git_commit, percentile, read_rss, skip_scenarios, start_servers
+
+# 시나리오 -> MCP 툴 이름 prefix (fastapi_mcp 는 operation_id 를 툴 이름으로 사용)
+TOOLS = {
+    "account": "get_account_riot_id_",
+    "match": "get_match_detail_all_",
+    "rag": "rag_",
+}
+
+
+def all_calls(scenario: str, players: int) -> list[tuple[str, str, dict | None]]:
+    """
+    call_for 가 만들 수 있는 REST 요청 전부
+    """
+    if scenario == "rag":
+        return [("POST", "/rag", {"champion": champion, "question": question})
+                for champion in RAG_CHAMPIONS for question in RAG_QUESTIONS]
+    if scenario == "account":
+        return [("GET", f"/account/player{i}/KR1", None) for i in range(players)]
+    return [("GET", f"/match/detail/all/player{i}/KR1?limit=3", None) for i in range(players)]
+
+
+def call_for(scenario: str, players: int) -> tuple[tuple[str, str, dict | None], dict]:
+    """
+    같은 요청의 (REST method, path, body), MCP 툴 인자
+    """
+    name = f"player{random.randrange(players)}"
+    if scenario == "account":
+        return ("GET", f"/account/{name}/KR1", None), {"game_name": name, "tag_line": "KR1"}
+    if scenario == "match":
+        return ("GET", f"/match/detail/all/{name}/KR1?limit=3", None), {"game_name": name, "tag_line": "KR1", "limit": 3}
+    body = {"champion": random.choice(RAG_CHAMPIONS), "question": random.choice(RAG_QUESTIONS)}
+    return ("POST", "/rag", body), body
+
+
+async def warm(base_url: str, scenario: str, players: int, concurrency: int = 16) -> dict:
+    """
+    업스트림 / 로컬 캐시를 채우는 요청을 전부 보내고 상태 코드별 개수 반환
+    """
+    statuses: dict[str, int] = {}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(client: httpx.AsyncClient, method: str, path: str, body: dict | None):
+        async with semaphore:
+            try:
+                key = str((await client.request(method, path, json=body)).status_code)
+            except httpx.HTTPError as e:
+                key = type(e).__name__
+            statuses[key] = statuses.get(key, 0) + 1
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0) as client:
+        await asyncio.gather(*[send(client, *call) for call in all_calls(scenario, players)])
+    return statuses
+
+
+def summarize(latencies: list[float], statuses: dict, elapsed: float) -> dict:
+    latencies.sort()
+    total = sum(statuses.values())
+    return {
+        "requests": total,
+        "ok": len(latencies),
+        "errors": total - len(latencies),
+        "statuses": statuses,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+async def run_rest(base_url: str, scenario: str, workers: int, duration: float, players: int) -> dict:
+    latencies: list[float] = []
+    statuses: dict[str, int] = {}
+    deadline = time.perf_counter() + duration
+
+    async def worker(client: httpx.AsyncClient):
+        while time.perf_counter() < deadline:
+            (method, path, body), _ = call_for(scenario, players)
+            started = time.perf_counter()
+            try:
+                resp = await client.request(method, path, json=body)
+                key = str(resp.status_code)
+            except httpx.HTTPError as e:
+                key = type(e).__name__
+            elapsed = time.perf_counter() - started
+            statuses[key] = statuses.get(key, 0) + 1
+            if key == "200":
+                latencies.append(elapsed)
+
+    limits = httpx.Limits(max_connections=workers, max_keepalive_connections=workers)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*[worker(client) for _ in range(workers)])
+        return summarize(latencies, statuses, time.perf_counter() - started)
+
+
+async def run_mcp(mcp_url: str, scenario: str, sessions: int, duration: float, players: int) -> dict:
+    latencies: list[float] = []
+    statuses: dict[str, int] = {}
+    session_open: list[float] = []
+    # 모든 세션이 열린 뒤 같은 시점에 호출 시작
+    ready = asyncio.Event()
+    opened = 0
+    deadline = 0.0
+
+    def count(key: str):
+        statuses[key] = statuses.get(key, 0) + 1
+
+    def mark_opened():
+        nonlocal opened, deadline
+        opened += 1
+        if opened == sessions:
+            deadline = time.perf_counter() + duration
+            ready.set()
+
+    async def session_worker():
+        started = time.perf_counter()
+        marked = False
+        try:
+            async with streamablehttp_client(mcp_url, timeout=60) as (read, write, _):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    tools = await session.list_tools()
+                    tool = next(t.name for t in tools.tools if t.name.startswith(TOOLS[scenario]))
+                    session_open.append(time.perf_counter() - started)
+                    marked = True
+                    mark_opened()
+                    await ready.wait()
+                    while time.perf_counter() < deadline:
+                        _, arguments = call_for(scenario, players)
+                        call_started = time.perf_counter()
+                        try:
+                            result = await session.call_tool(tool, arguments)
+                        except Exception as e:
+                            count(type(e).__name__)
+                            continue
+                        elapsed = time.perf_counter() - call_started
+                        if result.isError:
+                            count("tool_error")
+                        else:
+                            count("ok")
+                            latencies.append(elapsed)
+        except Exception as e:
+            count(f"session_{type(e).__name__}")
+            if not marked:
+                mark_opened()
+
+    await asyncio.gather(*[session_worker() for _ in range(sessions)])
+    # 세션을 여는 시간은 제외하고 호출 구간만으로 처리량 계산
+    result = summarize(latencies, statuses, duration)
+    session_open.sort()
+    result["session_open_p50_ms"] = percentile(session_open, 50)
+    result["session_open_max_ms"] = percentile(session_open, 100)
+    return result
+
+
+def overhead(rest: dict, mcp: dict) -> dict:
+    return {
+        f"overhead_{key}": round(mcp[key] - rest[key], 2) if mcp[key] is not None and rest[key] is not None else None
+        for key in ("p50_ms", "p95_ms", "p99_ms")
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(TOOLS))
+    parser.add_argument("--sessions", default="1,8,32", help="동시 MCP 세션 수 단계 (쉼표 구분)")
+    parser.add_argument("--duration", type=float, default=10.0, help="단계별 실행 시간 (초)")
+    parser.add_argument("--players", type=int, default=200, help="요청에 쓰는 서로 다른 Riot ID 수")
+    parser.add_argument("--latency-ms", type=float, default=30.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--embedder", choices=("stub", "model"), default="stub",
+                        help="/rag 임베딩: stub (해시, 오프라인) / model (Chroma 기본 ONNX 모델)")
+    parser.add_argument("--seed", type=int, default=23)
+    parser.add_argument("--out", default=None, help="결과 JSON 경로 (기본 bench/results/mcp-<commit>.json)")
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    scenarios = [s for s in args.scenarios.split(",") if s]
+    levels = [int(level) for level in args.sessions.split(",") if level]
+    unknown = set(scenarios) - set(TOOLS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    skipped = skip_scenarios(scenarios, args.embedder)
+    scenarios = [s for s in scenarios if s not in skipped]
+
+    git = git_commit()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        stub, app, stub_url, app_url = start_servers(args, tmp)
+        try:
+            for scenario in scenarios:
+                for level in levels:
+                    # 먼저 돌리는 쪽만 캐시 미스를 떠안지 않도록 두 실행 전에 캐시를 채움
+                    warmed = asyncio.run(warm(app_url, scenario, args.players))
+                    rest = asyncio.run(run_rest(app_url, scenario, level, args.duration, args.players))
+                    mcp = asyncio.run(run_mcp(f"{app_url}/mcp", scenario, level, args.duration, args.players))
+                    result = {
+                        "scenario": scenario,
+                        "sessions": level,
+                        "warm_statuses": warmed,
+                        "rest": rest,
+                        "mcp": mcp,
+                        **overhead(rest, mcp),
+                        **read_rss(app.pid),
+                    }
+                    results.append(result)
+                    print(json.dumps(result, ensure_ascii=False), flush=True)
+            upstream = httpx.get(f"{stub_url}/stub/stats").json()
+        finally:
+            for proc in (app, stub):
+                proc.terminate()
+                proc.wait()
+
+    report = {
+        **git,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "config": {k: v for k, v in vars(args).items() if k != "out"},
+        "upstream": upstream,
+        "skipped": skipped,
+        "results": results,
+    }
+    out = args.out or os.path.join(ROOT, "bench", "results", f"mcp-{git['commit'][:12] or 'unknown'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
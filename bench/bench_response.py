@@ -0,0 +1,157 @@
+"""
+응답 직렬화 / 압축 벤치마크
+
+    python -m bench.bench_response [반복 횟수] [--e2e]
+
+1) 직렬화 (before: jsonable_encoder + stdlib json, after: Pydantic dump_json / orjson)
+   - match_full: MatchDto 3경기 (fixtures/match.json)
+   - rag: /rag 응답 (fixtures 의 DDragon / FOW / 검색 chunk 전부)
+   - stream: /match/detail/stream NDJSON 20줄
+2) 전송 바이트: identity / gzip / br 크기와 압축 시간 (CompressionMiddleware 와 같은 설정)
+3) --e2e: 스텁 업스트림 + 앱을 띄워서 route 별 Accept-Encoding 에 따른 응답 시간 / 전송 바이트
+"""
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import List
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from models.match import MatchDto
+from routes.match import _slim_match
+from routes.rag import RagResponse
+from utils.compression import CompressionMiddleware, brotli
+from utils.docs.chunk import chunk_ddragon, chunk_fow, chunk_search
+from utils.docs.ddragon import champion_sections
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+PUUID = "fixture-puuid-3"
+
+
+def _load(name: str):
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return orjson.loads(f.read())
+
+
+def payloads() -> dict:
+    match = _load("match.json")
+    champion = next(iter(_load("ddragon_champion.json")["data"].values()))
+    chunks = {
+        **chunk_ddragon("Ahri", champion_sections(champion)),
+        **chunk_fow("Ahri", _load("fow_ahri.expected.json")),
+        **chunk_search("Ahri", "search", _load("search.json")),
+    }
+    rag = {"source": "vector+auto_sync", "documents": [c["text"] for c in chunks.values()],
+           "retrieval": "hybrid", "refreshing": False}
+    lines = [
+        {"index": i, "matchId": f"KR_{i}", "match": _slim_match(match, puuid=PUUID).model_dump(exclude_none=True)}
+        for i in range(20)
+    ]
+    return {
+        "match_full": [MatchDto(**match) for _ in range(3)],
+        "rag": rag,
+        "stream": lines,
+    }
+
+
+def serializers(name: str, value):
+    """
+    (before, after) 직렬화 함수
+    """
+    if name == "match_full":
+        adapter = TypeAdapter(List[MatchDto])
+        return (lambda: json.dumps(jsonable_encoder(value)).encode(),
+                lambda: adapter.dump_json(value))
+    if name == "rag":
+        adapter = TypeAdapter(RagResponse)
+        return (lambda: json.dumps(jsonable_encoder(value)).encode(),
+                lambda: adapter.dump_json(adapter.validate_python(value)))
+    return (lambda: b"".join(json.dumps(line, ensure_ascii=False, separators=(",", ":")).encode() + b"\n" for line in value),
+            lambda: b"".join(orjson.dumps(line) + b"\n" for line in value))
+
+
+def per_call_us(fn, rounds: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return round((time.perf_counter() - started) / rounds * 1e6, 1)
+
+
+def wire(body: bytes, rounds: int) -> dict:
+    middleware = CompressionMiddleware(None)
+    result = {"identity_bytes": len(body)}
+    for encoding in ("gzip", "br") if brotli is not None else ("gzip",):
+        compressed = middleware._compress(encoding, body)
+        result[f"{encoding}_bytes"] = len(compressed)
+        result[f"{encoding}_us"] = per_call_us(lambda: middleware._compress(encoding, body), rounds)
+    return result
+
+
+def e2e(rounds: int) -> dict:
+    import httpx
+    from bench.bench_load import start_servers
+    from types import SimpleNamespace
+
+    routes = {
+        "account": ("GET", "/account/player1/KR1", None),
+        "match_detail_all": ("GET", "/match/detail/all/player1/KR1?limit=3", None),
+        "match_stats": ("GET", "/match/stats/player1/KR1?limit=100", None),
+        "match_batch": ("POST", "/match/detail/batch", {"riotIds": [f"player{i}#KR1" for i in range(10)]}),
+    }
+    args = SimpleNamespace(latency_ms=0, jitter_ms=0, rate_429=0, retry_after=1, embedder="stub")
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        stub, app, _, app_url = start_servers(args, tmp)
+        try:
+            with httpx.Client(base_url=app_url, timeout=60.0) as client:
+                for name, (method, path, body) in routes.items():
+                    # 업스트림 / 로컬 저장소를 먼저 채워서 직렬화 + 압축 차이만 보이게
+                    client.request(method, path, json=body).raise_for_status()
+                    results[name] = {}
+                    for encoding in ("identity", "gzip", "br"):
+                        timings = []
+                        for _ in range(rounds):
+                            started = time.perf_counter()
+                            resp = client.request(method, path, json=body, headers={"Accept-Encoding": encoding})
+                            timings.append(time.perf_counter() - started)
+                        results[name][encoding] = {
+                            "content_encoding": resp.headers.get("content-encoding", "identity"),
+                            "wire_bytes": resp.num_bytes_downloaded,
+                            "body_bytes": len(resp.content),
+                            "p50_ms": round(statistics.median(timings) * 1000, 2),
+                        }
+        finally:
+            for proc in (app, stub):
+                proc.terminate()
+                proc.wait()
+    return results
+
+
+def main():
+    numbers = [a for a in sys.argv[1:] if a.isdigit()]
+    rounds = int(numbers[0]) if numbers else 200
+
+    results = {"rounds": rounds, "brotli": brotli is not None, "serialize": {}, "wire": {}}
+    for name, value in payloads().items():
+        before, after = serializers(name, value)
+        assert orjson.loads(before()) == orjson.loads(after()) if name != "stream" else before() == after()
+        before_us, after_us = per_call_us(before, rounds), per_call_us(after, rounds)
+        results["serialize"][name] = {
+            "before_us": before_us,
+            "after_us": after_us,
+            "speedup": round(before_us / after_us, 1),
+        }
+        results["wire"][name] = wire(after(), rounds)
+    if "--e2e" in sys.argv:
+        results["e2e"] = e2e(max(5, rounds // 10))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+슬림 경기 추출 벤치마크: MatchDto 검증 경로 vs 원본 JSON 직접 추출 경로
+
+    python -m bench.bench_slim_match [반복 횟수]
+
+fixtures/match.json 은 models/match.py 필드로 만든 합성 경기 (10명)
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import orjson
+
+from models.match import MatchDto
+from routes.match import _slim_match
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "match.json")
+PUUID = "fixture-puuid-3"
+
+
+def model_path(raw: bytes):
+    # 기존 경로: stdlib json → MatchDto 검증 → dict 재변환 → 슬림
+    data = MatchDto(**json.loads(raw)).dict(exclude_none=True)
+    return _slim_match(data, puuid=PUUID)
+
+
+def raw_path(raw: bytes):
+    # 새 경로: orjson → dict 에서 바로 슬림 (utils/riot/base.py 와 같은 파서)
+    return _slim_match(orjson.loads(raw), puuid=PUUID)
+
+
+def raw_stdlib_path(raw: bytes):
+    # 참고용: 파서만 stdlib json (orjson 은 파싱 중 임시 버퍼로 peak 메모리가 더 큼)
+    return _slim_match(json.loads(raw), puuid=PUUID)
+
+
+def measure(fn, raw: bytes, rounds: int) -> dict:
+    fn(raw)
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    for _ in range(rounds):
+        fn(raw)
+    wall = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+
+    tracemalloc.start()
+    result = fn(raw)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {
+        "wall_us_per_match": round(wall / rounds * 1e6, 1),
+        "cpu_us_per_match": round(cpu / rounds * 1e6, 1),
+        "peak_alloc_kib_per_match": round(peak / 1024, 1),
+        "retained_kib_per_match": round(retained / 1024, 1),
+    }
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    with open(FIXTURE, "rb") as f:
+        raw = f.read()
+    assert model_path(raw) == raw_path(raw) == raw_stdlib_path(raw)
+
+    results = {"fixture_bytes": len(raw), "rounds": rounds}
+    for name, fn in (("model", model_path), ("raw", raw_path), ("raw_stdlib", raw_stdlib_path)):
+        results[name] = measure(fn, raw, rounds)
+    results["cpu_speedup"] = round(results["model"]["cpu_us_per_match"] / results["raw"]["cpu_us_per_match"], 1)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+서버 시작 시간 벤치마크: 프로세스 시작 → main import → 첫 응답까지
+
+    python -m bench.bench_startup [반복 횟수]
+
+- import: `import main` 에 걸린 시간 (별도 프로세스)
+- first_response: uvicorn 프로세스 시작부터 /stats/riot 가 200 을 돌려줄 때까지
+  (Riot / RAG 외부 호출 없이 라우터가 바로 응답하는지 확인)
+CHROMA_PERSIST 등 파일 경로는 임시 디렉터리로 바꿔서 실행
+"""
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def bench_env(tmp: str) -> dict:
+    return {
+        **os.environ,
+        "CHROMA_PERSIST": os.path.join(tmp, "chroma_db"),
+        "EMBED_CACHE_PATH": os.path.join(tmp, "embed_cache.sqlite3"),
+        "MATCH_STORE_PATH": os.path.join(tmp, "match_store.sqlite3"),
+        "DDRAGON_CACHE_DIR": os.path.join(tmp, "ddragon_cache"),
+        "DDRAGON_PREWARM": "0",
+    }
+
+
+def measure_import(env: dict) -> float:
+    out = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def measure_first_response(env: dict, timeout: float = 60.0) -> float:
+    port = free_port()
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(timeout=1.0) as client:
+            while time.perf_counter() - started < timeout:
+                try:
+                    if client.get(f"http://127.0.0.1:{port}/stats/riot").status_code == 200:
+                        return time.perf_counter() - started
+                except httpx.TransportError:
+                    pass
+                if proc.poll() is not None:
+                    raise RuntimeError(f"server exited with {proc.returncode}")
+                time.sleep(0.01)
+        raise TimeoutError("server did not respond")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def summary(values: list[float]) -> dict:
+    return {
+        "min_ms": round(min(values) * 1e3, 1),
+        "median_ms": round(statistics.median(values) * 1e3, 1),
+        "max_ms": round(max(values) * 1e3, 1),
+    }
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    imports, responses = [], []
+    for _ in range(rounds):
+        # 매 회 새 디렉터리: 디스크 캐시 없이 콜드 스타트
+        with tempfile.TemporaryDirectory() as tmp:
+            env = bench_env(tmp)
+            imports.append(measure_import(env))
+            responses.append(measure_first_response(env))
+    print(json.dumps({
+        "rounds": rounds,
+        "import": summary(imports),
+        "first_response": summary(responses),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
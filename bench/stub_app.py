@@ -0,0 +1,56 @@
+"""
+오프라인 벤치마크용 앱 실행기: Chroma 기본 임베딩(ONNX all-MiniLM-L6-v2) 대신 해시 임베딩으로 main:app 실행
+
+    python -m bench.stub_app --host 127.0.0.1 --port 8000 [uvicorn 옵션...]
+
+- 모델 다운로드 없이 /rag 경로(수집 → chunk → 임베딩 → Chroma / BM25 검색)를 그대로 실행
+- 임베딩은 단어 해시를 384차원(모델과 같은 크기)에 더한 정규화 벡터: 검색 품질이 아니라 지연 / 처리량 측정용
+- 임베딩 캐시가 실제 모델 값과 섞이지 않도록 EMBEDDING_MODEL_ID 를 바꿔서 실행
+"""
+import hashlib
+import os
+import sys
+
+import numpy as np
+
+DIMENSIONS = 384
+
+
+def model_available() -> bool:
+    """
+    Chroma 기본 임베딩 모델 파일이 로컬에 받아져 있는지
+    """
+    from chromadb.utils.embedding_functions.onnx_mini_lm_l6_v2 import ONNXMiniLM_L6_V2
+
+    folder = os.path.join(ONNXMiniLM_L6_V2.DOWNLOAD_PATH, ONNXMiniLM_L6_V2.EXTRACTED_FOLDER_NAME)
+    return os.path.exists(os.path.join(folder, "model.onnx"))
+
+
+def hash_embed(texts: list[str]) -> list[np.ndarray]:
+    vectors = []
+    for text in texts:
+        vector = np.zeros(DIMENSIONS, dtype=np.float32)
+        for word in text.lower().split():
+            vector[int.from_bytes(hashlib.blake2b(word.encode(), digest_size=4).digest(), "little") % DIMENSIONS] += 1.0
+        vectors.append(vector / (np.linalg.norm(vector) or 1.0))
+    return vectors
+
+
+def install():
+    from chromadb.utils import embedding_functions
+
+    # utils/docs/store.py 가 쓰는 기본 임베딩 함수 (호출할 때 ONNX 모델을 불러옴)
+    embedding_functions.DefaultEmbeddingFunction.__call__ = lambda self, input: hash_embed(list(input))
+    os.environ["EMBEDDING_MODEL_ID"] = "bench-hash-384"
+
+
+def main():
+    install()
+    import uvicorn
+
+    sys.argv = ["uvicorn", "main:app", *sys.argv[1:]]
+    sys.exit(uvicorn.main())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+오프라인 벤치마크용 업스트림 스텁 서버 (Riot account-v1 / league-v4 / match-v5, DDragon, fow.lol, 검색)
+
+    python -m bench.stub_server --port 9100 --latency-ms 30 --jitter-ms 10 --rate-429 0.01
+
+앱은 아래 환경변수로 이 서버를 바라보게 해서 실행 (bench/bench_load.py 가 자동으로 설정)
+    RIOT_BASE_URL_TEMPLATE=http://127.0.0.1:9100/riot/{region}
+    DDRAGON_CDN=http://127.0.0.1:9100/ddragon
+    FOW_BASE_URL=http://127.0.0.1:9100/fow
+    SEARCH_URL=http://127.0.0.1:9100/search
+
+- 응답 본문은 fixtures/ 의 기록 데이터 (puuid / matchId 등만 요청에 맞게 바꿈)
+- 플레이어마다 matches 개의 경기가 30분 간격으로 과거로 이어짐 (startTime / endTime / start / count 지원)
+- latency-ms ± jitter-ms 지연, Riot 경로는 rate-429 확률로 429 + Retry-After
+"""
+import argparse
+import asyncio
+import copy
+import os
+import random
+import time
+import zlib
+
+import orjson
+from fastapi import FastAPI, Request, Response
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+CONFIG = {
+    "latency_ms": float(os.getenv("STUB_LATENCY_MS", "0")),
+    "jitter_ms": float(os.getenv("STUB_JITTER_MS", "0")),
+    "rate_429": float(os.getenv("STUB_RATE_429", "0")),
+    "retry_after": int(os.getenv("STUB_RETRY_AFTER", "1")),
+    # 앱의 rate limiter 가 병목이 되지 않도록 넉넉한 한도를 응답 헤더로 알려줌
+    "app_limit": os.getenv("STUB_APP_LIMIT", "100000:1,6000000:120"),
+    "matches": int(os.getenv("STUB_MATCHES", "200")),
+}
+STARTED_AT = time.time()
+MATCH_INTERVAL = 1800
+
+
+def _load(name: str):
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+
+ACCOUNT = orjson.loads(_load("account.json"))
+LEAGUE = orjson.loads(_load("league.json"))
+MATCH = orjson.loads(_load("match.json"))
+VERSIONS = _load("ddragon_versions.json")
+CHAMPION = orjson.loads(_load("ddragon_champion.json"))
+FOW_HTML = _load("fow_ahri.html")
+SEARCH = _load("search.json")
+
+app = FastAPI()
+_stats = {"requests": 0, "rate_limited": 0}
+# match id -> puuid (경기 상세에서 요청한 플레이어를 참가자로 넣기 위해)
+_match_owner: dict[str, str] = {}
+_match_cache: dict[str, bytes] = {}
+
+
+async def _delay():
+    delay = CONFIG["latency_ms"] + random.uniform(-CONFIG["jitter_ms"], CONFIG["jitter_ms"])
+    if delay > 0:
+        await asyncio.sleep(delay / 1000)
+
+
+def _riot_headers() -> dict:
+    return {
+        "X-App-Rate-Limit": CONFIG["app_limit"],
+        "X-App-Rate-Limit-Count": ",".join(f"1:{w.split(':')[1]}" for w in CONFIG["app_limit"].split(",")),
+    }
+
+
+async def _riot(body) -> Response:
+    _stats["requests"] += 1
+    await _delay()
+    headers = _riot_headers()
+    if CONFIG["rate_429"] and random.random() < CONFIG["rate_429"]:
+        _stats["rate_limited"] += 1
+        headers.update({"Retry-After": str(CONFIG["retry_after"]), "X-Rate-Limit-Type": "method"})
+        return Response(b'{"status":{"message":"Rate limit exceeded","status_code":429}}', 429,
+                        headers=headers, media_type="application/json")
+    content = body if isinstance(body, bytes) else orjson.dumps(body)
+    return Response(content, headers=headers, media_type="application/json")
+
+
+def _puuid(game_name: str) -> str:
+    return f"bench-puuid-{game_name.lower()}"
+
+
+def _match_ids(puuid: str) -> list[tuple[str, float]]:
+    # 최신순 (id, 시작 시각)
+    prefix = zlib.crc32(puuid.encode()) % 1_000_000
+    return [(f"KR_{prefix:06d}{seq:04d}", STARTED_AT - seq * MATCH_INTERVAL) for seq in range(CONFIG["matches"])]
+
+
+# ------------------------
+# Riot
+# ------------------------
+@app.get("/riot/{region}/riot/account/v1/accounts/by-riot-id/{game_name}/{tag_line}")
+async def account_by_riot_id(region: str, game_name: str, tag_line: str):
+    return await _riot({**ACCOUNT, "puuid": _puuid(game_name), "gameName": game_name, "tagLine": tag_line})
+
+
+@app.get("/riot/{region}/riot/account/v1/accounts/by-puuid/{puuid}")
+async def account_by_puuid(region: str, puuid: str):
+    game_name = puuid.removeprefix("bench-puuid-")
+    return await _riot({**ACCOUNT, "puuid": puuid, "gameName": game_name})
+
+
+@app.get("/riot/{region}/lol/league/v4/entries/by-puuid/{puuid}")
+async def league_entries(region: str, puuid: str):
+    return await _riot([{**entry, "puuid": puuid} for entry in LEAGUE])
+
+
+@app.get("/riot/{region}/lol/match/v5/matches/by-puuid/{puuid}/ids")
+async def match_ids(region: str, puuid: str, request: Request):
+    q = request.query_params
+    start, count = int(q.get("start", 0)), int(q.get("count", 20))
+    start_time = float(q["startTime"]) if "startTime" in q else None
+    end_time = float(q["endTime"]) if "endTime" in q else None
+    ids = [
+        match_id for match_id, started in _match_ids(puuid)
+        if (start_time is None or started >= start_time) and (end_time is None or started <= end_time)
+    ]
+    page = ids[start:start + count]
+    for match_id in page:
+        _match_owner[match_id] = puuid
+    return await _riot(page)
+
+
+@app.get("/riot/{region}/lol/match/v5/matches/{match_id}")
+async def match(region: str, match_id: str):
+    body = _match_cache.get(match_id)
+    if body is None:
+        data = copy.deepcopy(MATCH)
+        data["metadata"]["matchId"] = match_id
+        owner = _match_owner.get(match_id)
+        if owner:
+            me = data["info"]["participants"][0]
+            me["puuid"] = owner
+            me["riotIdGameName"] = owner.removeprefix("bench-puuid-")
+            data["metadata"]["participants"][0] = owner
+        body = _match_cache[match_id] = orjson.dumps(data)
+    return await _riot(body)
+
+
+# ------------------------
+# DDragon / fow.lol / 검색
+# ------------------------
+@app.get("/ddragon/api/versions.json")
+async def ddragon_versions():
+    await _delay()
+    return Response(VERSIONS, media_type="application/json", headers={"ETag": '"bench-versions"'})
+
+
+@app.get("/ddragon/cdn/{version}/data/en_US/champion/{champion}.json")
+async def ddragon_champion(version: str, champion: str):
+    await _delay()
+    # 어떤 챔피언이든 기록된 챔피언 데이터를 이름만 바꿔서 반환
+    data = next(iter(CHAMPION["data"].values()))
+    body = {**CHAMPION, "version": version, "data": {champion: {**data, "id": champion, "name": champion}}}
+    return Response(orjson.dumps(body), media_type="application/json")
+
+
+@app.get("/ddragon/cdn/{version}/data/en_US/championFull.json")
+async def ddragon_champion_full(version: str):
+    await _delay()
+    return Response(orjson.dumps({**CHAMPION, "version": version}), media_type="application/json")
+
+
+@app.get("/fow/stats/{champion}")
+async def fow_stats(champion: str):
+    await _delay()
+    return Response(FOW_HTML, media_type="text/html; charset=utf-8")
+
+
+@app.get("/search")
+async def search():
+    await _delay()
+    return Response(SEARCH, media_type="application/json")
+
+
+@app.get("/stub/stats")
+async def stub_stats():
+    return _stats
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=CONFIG["latency_ms"])
+    parser.add_argument("--jitter-ms", type=float, default=CONFIG["jitter_ms"])
+    parser.add_argument("--rate-429", type=float, default=CONFIG["rate_429"])
+    parser.add_argument("--retry-after", type=int, default=CONFIG["retry_after"])
+    parser.add_argument("--app-limit", default=CONFIG["app_limit"])
+    parser.add_argument("--matches", type=int, default=CONFIG["matches"])
+    args = parser.parse_args()
+    CONFIG.update(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, rate_429=args.rate_429,
+        retry_after=args.retry_after, app_limit=args.app_limit, matches=args.matches,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
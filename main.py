@@ -1,12 +1,59 @@
+import os
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi_mcp import FastApiMCP
 import uvicorn
+import httpx
 from routes.account import router as account_router
 from routes.league import router as league_router
 from routes.match import router as match_router
 from routes.rag import router as rag_router
-app = FastAPI()
+from routes.stats import router as stats_router
+from routes.metrics import router as metrics_router
+from utils.riot.base import init_clients, close_clients, SHARED_STATE
+from utils.riot.match import MATCH_STORE
+from utils.docs.http import close_client as close_docs_client
+from utils.docs.prewarm import run_prewarm_scheduler
+from utils.docs.store import INGEST_QUEUE, EMBED_CACHE, warm_up as warm_up_chroma
+from utils.metrics import ServerTimingMiddleware
+from utils.compression import CompressionMiddleware
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Riot API 클라이언트를 region 별로 한 번만 열고 종료 시 닫음
+    await init_clients()
+    # Chroma 쓰기 지연 큐 (종료 시 남은 문서까지 저장)
+    INGEST_QUEUE.start()
+    # Chroma/임베딩 모델은 지연 생성: 포트를 연 뒤 백그라운드에서 미리 로드 (CHROMA_WARMUP=0 으로 끔)
+    warmup = asyncio.create_task(asyncio.to_thread(warm_up_chroma)) if os.getenv("CHROMA_WARMUP", "1") != "0" else None
+    # 새 패치가 나오면 전체 챔피언 문서를 미리 저장 (DDRAGON_PREWARM=0 으로 끔)
+    prewarm = asyncio.create_task(run_prewarm_scheduler()) if os.getenv("DDRAGON_PREWARM", "1") != "0" else None
+    yield
+    # 남은 태스크를 정리한 뒤 저장소를 닫음
+    # - prewarm 은 취소하고 끝날 때까지 기다림
+    # - warm up 은 스레드라 취소해도 멈추지 않으므로 끝날 때까지 기다림 (닫은 Chroma / 임베딩 캐시를 건드리지 않도록)
+    if prewarm is not None:
+        prewarm.cancel()
+    for task in (prewarm, warmup):
+        if task is not None:
+            with suppress(asyncio.CancelledError):
+                await task
+    await close_clients()
+    await INGEST_QUEUE.close()
+    MATCH_STORE.close()
+    if SHARED_STATE is not None:
+        SHARED_STATE.close()
+    EMBED_CACHE.close()
+    await close_docs_client()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS: allow only frontend origin
 app.add_middleware(
@@ -18,18 +65,51 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 브라우저 개발자 도구에서 업스트림 시간을 볼 수 있도록
+    expose_headers=["Server-Timing"],
 )
+# 큰 JSON 응답(경기 통계 / RAG 문서 등) brotli·gzip 압축 (COMPRESS_MIN_SIZE 바이트 이상만)
+app.add_middleware(CompressionMiddleware, minimum_size=int(os.getenv("COMPRESS_MIN_SIZE", "1024")))
+# route 별 지연시간 히스토그램 + Server-Timing 헤더 (압축 시간 포함)
+app.add_middleware(ServerTimingMiddleware)
 app.include_router(account_router, prefix="/account", tags=["account"])
 app.include_router(league_router, prefix="/league", tags=["league"])
 app.include_router(match_router, prefix="/match", tags=["match"])
 app.include_router(rag_router, prefix="/rag", tags=["rag"])
+# 운영용 통계 (MCP 툴로 노출하지 않음)
+app.include_router(stats_router, prefix="/stats", tags=["stats"], include_in_schema=False)
+app.include_router(metrics_router, prefix="/metrics", tags=["metrics"], include_in_schema=False)
 
 mcp = FastApiMCP(app,
                  name="Expr MCP",
                  describe_all_responses=True,
-                 describe_full_response_schema=True
+                 describe_full_response_schema=True,
+                 # 툴 호출은 앱 내부(ASGI) 호출이므로 압축했다가 바로 푸는 일이 없도록 identity 요청
+                 http_client=httpx.AsyncClient(
+                     transport=httpx.ASGITransport(app=app, raise_app_exceptions=False),
+                     base_url="http://apiserver",
+                     timeout=10.0,
+                     headers={"Accept-Encoding": "identity"},
+                 ),
                  )
 mcp.mount_http()
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # WEB_CONCURRENCY > 1 이면 worker 프로세스 여러 개로 실행
+    # - worker 끼리 Riot rate limit / account·league 캐시 / prewarm·문서 갱신 lease 를 공유하도록 공유 상태 파일 기본값 지정
+    # - BM25 역색인은 worker 마다 따로 있으므로 컬렉션 문서 수가 바뀌면 다시 만듦
+    # - RAG 문서 저장소는 CHROMA_HOST 로 Chroma 서버 하나를 같이 써야 함
+    #   (로컬 PersistentClient 는 worker 마다 벡터 인덱스를 따로 들고 있어 다른 worker 의 쓰기가 보이지 않음)
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    if workers > 1:
+        os.environ.setdefault("RIOT_SHARED_STATE_PATH", "./riot_shared.sqlite3")
+        os.environ.setdefault("RAG_LEXICAL_RECHECK", "5")
+        if not os.getenv("CHROMA_HOST"):
+            logger.warning(
+                f"WEB_CONCURRENCY={workers} without CHROMA_HOST: each worker uses its own local Chroma "
+                "vector index, RAG documents stored by one worker are not visible to the others"
+            )
+        uvicorn.run("main:app", host="0.0.0.0", port=8000, workers=workers)
+    else:
+        # 문자열로 넘기면 uvicorn 이 main 을 한 번 더 import 하므로 이미 만든 app 을 그대로 넘김
+        uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,13 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+# 한 번에 받을 수 있는 최대 항목 수 (5v5 로비 + 여유)
+MAX_BATCH_SIZE = 20
+
+class BatchRequestDTO(BaseModel):
+    riotIds: List[str] = Field(default_factory=list, max_length=MAX_BATCH_SIZE, description='"게임이름#태그" 형식')
+    puuids: List[str] = Field(default_factory=list, max_length=MAX_BATCH_SIZE)
+
+class BatchErrorDTO(BaseModel):
+    status: int
+    detail: str
\ No newline at end of file
@@ -1,8 +1,32 @@
+import asyncio
 from fastapi import APIRouter
+from typing import List, Optional
+from pydantic import BaseModel
 from utils.riot.account import get_account_by_riot_id, get_account_by_puuid
+from utils.riot.batch import split_riot_id, gather_partial
 from models.account import AccountDTO
+from models.batch import BatchRequestDTO, BatchErrorDTO
 router = APIRouter()
 
+class AccountBatchItemDTO(BaseModel):
+    input: str
+    result: Optional[AccountDTO] = None
+    error: Optional[BatchErrorDTO] = None
+
+@router.post("/batch", response_model=List[AccountBatchItemDTO], response_model_exclude_none=True)
+async def get_account_batch(req: BatchRequestDTO):
+    """
+    여러 Riot ID / puuid 계정을 한 번에 조회 (항목별 실패는 error 로 반환)
+    """
+    async def by_riot_id(riot_id: str):
+        return await get_account_by_riot_id(*split_riot_id(riot_id))
+
+    riot_results, puuid_results = await asyncio.gather(
+        gather_partial(req.riotIds, by_riot_id),
+        gather_partial(req.puuids, get_account_by_puuid),
+    )
+    return riot_results + puuid_results
+
 @router.get("/{game_name}/{tag_line}", response_model=AccountDTO)
 async def get_account_riot_id(game_name: str, tag_line: str):
     return await get_account_by_riot_id(game_name, tag_line)
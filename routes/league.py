@@ -1,10 +1,25 @@
 from fastapi import APIRouter
-from typing import List
+from typing import List, Optional
+from pydantic import BaseModel
 from utils.riot.league import get_league_entry_by_puuid
 from utils.riot.account import get_account_by_riot_id
+from utils.riot.batch import gather_by_player
 from models.league import LeagueEntryDTO
+from models.batch import BatchRequestDTO, BatchErrorDTO
 router = APIRouter()
 
+class LeagueBatchItemDTO(BaseModel):
+    input: str
+    result: Optional[List[LeagueEntryDTO]] = None
+    error: Optional[BatchErrorDTO] = None
+
+@router.post("/batch", response_model=List[LeagueBatchItemDTO], response_model_exclude_none=True)
+async def get_league_batch(req: BatchRequestDTO):
+    """
+    여러 Riot ID / puuid 의 랭크 정보를 한 번에 조회 (항목별 실패는 error 로 반환)
+    """
+    return await gather_by_player(req, get_league_entry_by_puuid)
+
 @router.get("/{game_name}/{tag_line}", response_model=List[LeagueEntryDTO])
 async def get_league_by_riot_id(game_name: str, tag_line: str):
     account = await get_account_by_riot_id(game_name, tag_line)
@@ -1,18 +1,26 @@
 # routes/match.py
-from typing import List
-import asyncio
-from fastapi import APIRouter
+import time
+import orjson
+from typing import List, Literal
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 
 from pydantic import BaseModel
-from models.match import MatchDto
 from utils.riot.account import get_account_by_riot_id
+from utils.riot.batch import gather_by_player
+from models.batch import BatchRequestDTO, BatchErrorDTO
 from utils.riot.match import (
-    get_match_ids_by_puuid,
-    limited_match_detail,
+    get_match_history,
+    get_match_data_many,
+    iter_match_data,
 )
+from utils.riot.stats import ParticipantColumns, summarize, group_by
 
 router = APIRouter()
 
+# 스트리밍 조회 상한 (Riot match id 목록 한 페이지 크기)
+MAX_STREAM_LIMIT = 100
+
 
 class SlimParticipantDto(BaseModel):
     summonerName: str | None = None
@@ -36,19 +44,52 @@ class SlimMatchDto(BaseModel):
     info: SlimInfoDto
 
 
+class SlimMatchBatchItemDto(BaseModel):
+    input: str
+    result: List[SlimMatchDto] | None = None
+    error: BatchErrorDTO | None = None
+
+
+class StatLineDto(BaseModel):
+    name: str | None = None
+    games: int
+    wins: int | None = None
+    winRate: float | None = None
+    kills: float | None = None
+    deaths: float | None = None
+    assists: float | None = None
+    kda: float | None = None
+    csPerMin: float | None = None
+    damageShare: float | None = None
+    goldPerMin: float | None = None
+
+
+class MatchStatsDto(BaseModel):
+    games: int
+    player: StatLineDto
+    champions: List[StatLineDto]
+    positions: List[StatLineDto]
+    lobbyChampions: List[StatLineDto]
+    elapsedMs: float
+
+
 # LLM 토큰 과다를 막기 위해 필요한 필드만 남기는 슬라이싱
+# (SlimParticipantDto 필드, 원본 ParticipantDto 필드)
+_SLIM_PARTICIPANT_FIELDS = (
+    ("teamPosition", "teamPosition"),
+    ("championName", "championName"),
+    ("kills", "kills"),
+    ("deaths", "deaths"),
+    ("assists", "assists"),
+    ("cs", "totalMinionsKilled"),
+    ("win", "win"),
+)
+
+
 def _slim_participant(p: dict) -> SlimParticipantDto:
-    name = p.get("summonerName") or p.get("riotIdGameName") or None
-    return SlimParticipantDto(
-        summonerName=name,
-        teamPosition=p.get("teamPosition"),
-        championName=p.get("championName"),
-        kills=p.get("kills"),
-        deaths=p.get("deaths"),
-        assists=p.get("assists"),
-        cs=p.get("totalMinionsKilled"),
-        win=p.get("win"),
-    )
+    slim = {field: p.get(src) for field, src in _SLIM_PARTICIPANT_FIELDS}
+    slim["summonerName"] = p.get("summonerName") or p.get("riotIdGameName") or None
+    return SlimParticipantDto(**slim)
 
 
 def _slim_team(t: dict) -> dict:
@@ -79,9 +120,12 @@ def _pick_me(info: dict, puuid: str | None = None, game_name: str | None = None,
     return None
 
 
-def _slim_match(match: MatchDto, puuid: str | None = None, game_name: str | None = None, tag_line: str | None = None) -> SlimMatchDto:
-    data = match.dict(exclude_none=True)
-    info = data.get("info", {})
+def _slim_match(data: dict, puuid: str | None = None, game_name: str | None = None, tag_line: str | None = None) -> SlimMatchDto:
+    """
+    Riot 원본 JSON dict 에서 바로 슬림 버전 추출
+    (10명 x 200+ 필드의 MatchDto 검증/재직렬화를 거치지 않음)
+    """
+    info = data.get("info") or {}
 
     me_raw = _pick_me(info, puuid, game_name, tag_line)
     me = _slim_participant(me_raw) if me_raw else None
@@ -89,7 +133,7 @@ def _slim_match(match: MatchDto, puuid: str | None = None, game_name: str | None
     slim_info = SlimInfoDto(
         queueId=info.get("queueId"),
         gameMode=info.get("gameMode"),
-        participants=[me] if me else [_slim_participant(p) for p in info.get("participants", [])[:1] if p],
+        participants=[me] if me else [_slim_participant(p) for p in (info.get("participants") or [])[:1] if p],
     )
 
     return SlimMatchDto(
@@ -106,18 +150,111 @@ def _slim_match(match: MatchDto, puuid: str | None = None, game_name: str | None
 async def get_match_detail_all(game_name: str, tag_line: str, limit: int = 10):
     """
     - 비동기 병렬 처리
-    - rate limit 방지 (Semaphore)
+    - rate limit 방지 (Riot 응답 헤더 기반 스케줄러)
+    - 이미 받은 경기는 로컬 저장소에서 바로 반환
     - 최근 limit개만
     """
     account = await get_account_by_riot_id(game_name, tag_line)
-    match_ids = await get_match_ids_by_puuid(account.puuid)
 
-    # 최근 N개만 사용 (상한 3개로 제한하여 응답 속도 확보)
+    # 최근 N개만 사용 (상한 3개로 제한하여 응답 속도 확보, 더 많은 경기는 /detail/stream 사용)
     safe_limit = max(1, min(limit, 3))
-    match_ids = match_ids[:safe_limit]
+    match_ids = await get_match_history(account.puuid, safe_limit)
 
-    tasks = [limited_match_detail(mid) for mid in match_ids]
-    match_details = await asyncio.gather(*tasks)
+    match_details = await get_match_data_many(match_ids)
 
     # 필요 필드만 남긴 슬림 버전 반환
     return [_slim_match(m, puuid=account.puuid, game_name=game_name, tag_line=tag_line) for m in match_details]
+
+
+@router.post(
+    "/detail/batch",
+    response_model=List[SlimMatchBatchItemDto],
+    response_model_exclude_none=True,
+)
+async def get_match_detail_batch(req: BatchRequestDTO, limit: int = 3):
+    """
+    - 여러 Riot ID / puuid 의 최근 limit개(최대 3개) 슬림 경기를 한 번에 조회
+    - 항목별 실패는 error 로 반환
+    """
+    safe_limit = max(1, min(limit, 3))
+
+    async def recent_matches(puuid: str):
+        match_ids = await get_match_history(puuid, safe_limit)
+        return [_slim_match(m, puuid=puuid) for m in await get_match_data_many(match_ids)]
+
+    return await gather_by_player(req, recent_matches)
+
+
+def _stream_line(payload: dict, fmt: str, event: str = "match") -> bytes:
+    body = orjson.dumps(payload)
+    if fmt == "sse":
+        return b"event: " + event.encode() + b"\ndata: " + body + b"\n\n"
+    return body + b"\n"
+
+
+# 스트리밍 응답은 MCP 툴로 노출하지 않음 (툴 호출은 전부 모아서 한 번에 반환하므로 /detail/all 의 경기 수 제한을 우회)
+@router.get("/detail/stream/{game_name}/{tag_line}", include_in_schema=False)
+async def stream_match_detail(
+    game_name: str,
+    tag_line: str,
+    limit: int = 20,
+    format: Literal["ndjson", "sse"] = "ndjson",
+    order: Literal["completion", "requested"] = "completion",
+):
+    """
+    - 최근 limit개(최대 100) 슬림 경기를 받는 즉시 한 줄씩 전송
+    - format: ndjson (한 줄에 JSON 하나) / sse (Server-Sent Events)
+    - order: completion (도착 순) / requested (최신순 유지)
+    - 각 줄: {"index", "matchId", "match"} 또는 실패 시 {"index", "matchId", "error"}
+    """
+    account = await get_account_by_riot_id(game_name, tag_line)
+    safe_limit = max(1, min(limit, MAX_STREAM_LIMIT))
+    match_ids = await get_match_history(account.puuid, safe_limit)
+
+    async def generate():
+        async for index, match_id, data, error in iter_match_data(match_ids, ordered=order == "requested"):
+            item = {"index": index, "matchId": match_id}
+            if error is None:
+                slim = _slim_match(data, puuid=account.puuid, game_name=game_name, tag_line=tag_line)
+                item["match"] = slim.model_dump(exclude_none=True)
+            elif isinstance(error, HTTPException):
+                item["error"] = {"status": error.status_code, "detail": error.detail}
+            else:
+                item["error"] = {"status": 500, "detail": str(error)}
+            yield _stream_line(item, format)
+        if format == "sse":
+            yield _stream_line({"count": len(match_ids)}, format, event="end")
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(generate(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+
+@router.get(
+    "/stats/{game_name}/{tag_line}",
+    response_model=MatchStatsDto,
+    response_model_exclude_none=True,
+)
+async def get_match_stats(game_name: str, tag_line: str, limit: int = 20, min_games: int = 1):
+    """
+    - 최근 limit개(최대 100) 경기 요약 통계
+    - player: 본인 전체 승률/KDA/CS 분당/딜 비중
+    - champions / positions: 본인 챔피언별 / 포지션별
+    - lobbyChampions: 같은 경기에 등장한 모든 챔피언별 (min_games 이상)
+    """
+    account = await get_account_by_riot_id(game_name, tag_line)
+    safe_limit = max(1, min(limit, MAX_STREAM_LIMIT))
+    match_ids = await get_match_history(account.puuid, safe_limit)
+    matches = await get_match_data_many(match_ids)
+
+    started = time.perf_counter()
+    cols = ParticipantColumns.from_matches(matches, puuid=account.puuid)
+    me = cols.columns["is_me"]
+    result = {
+        "games": cols.games,
+        "player": summarize(cols, me),
+        "champions": group_by(cols, "champion", me),
+        "positions": group_by(cols, "position", me),
+        "lobbyChampions": group_by(cols, "champion", min_games=max(1, min_games)),
+    }
+    result["elapsedMs"] = round((time.perf_counter() - started) * 1000, 3)
+    return result
@@ -0,0 +1,35 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from utils.metrics import render_histograms, render_gauges
+from utils.riot.base import get_pool_stats
+from utils.riot.match import MATCH_STORE
+from utils.riot.account import ACCOUNT_CACHE
+from utils.riot.league import LEAGUE_CACHE
+from utils.docs.store import EMBED_CACHE, INGEST_QUEUE
+router = APIRouter()
+
+@router.get("", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Prometheus 텍스트 형식 (히스토그램 + 캐시/풀/큐 상태)
+    """
+    caches = {
+        "account": ACCOUNT_CACHE.stats(),
+        "league": LEAGUE_CACHE.stats(),
+        "match_store": MATCH_STORE.stats(),
+        "embedding": EMBED_CACHE.stats(),
+    }
+    # httpx 내부 구조를 읽지 못한 region 은 커넥션 gauge 에서 뺌
+    pool = {region: stats for region, stats in get_pool_stats().items() if stats["connections"] is not None}
+    lines = render_histograms()
+    lines += render_gauges("expr_cache_hit_ratio", "Cache hit ratio since start", "cache",
+                           {name: stats["hit_ratio"] for name, stats in caches.items()})
+    lines += render_gauges("expr_cache_misses", "Cache misses since start", "cache",
+                           {name: stats["misses"] for name, stats in caches.items()})
+    lines += render_gauges("expr_riot_connections_in_use", "Riot API pooled connections in use", "region",
+                           {region: stats["in_use"] for region, stats in pool.items()})
+    lines += render_gauges("expr_riot_connections_idle", "Riot API pooled idle connections", "region",
+                           {region: stats["idle"] for region, stats in pool.items()})
+    lines += render_gauges("expr_ingest_pending", "Chroma documents waiting for the next flush", "queue",
+                           {"chroma_ingest": INGEST_QUEUE.stats()["pending"]})
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
@@ -1,15 +1,11 @@
-import os
+import asyncio
 import logging
-import json
-import requests
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import Optional, List
-from collections import Counter
+from typing import List, Literal, Optional
 
-from utils.docs.store import store_champion_data, search_champion
-from utils.docs.ddragon import fetch_champion_ddragon
-from utils.docs.fow import crawl_fow
+from utils.docs.store import search_champion
+from utils.docs.sync import sync_champion
 from utils.docs.champion_kor_to_en import champion_kor_to_en
 
 logger = logging.getLogger(__name__)
@@ -21,53 +17,25 @@ class RagRequest(BaseModel):
     question: str
     n_results: Optional[int] = 3
     force_refresh: Optional[bool] = False
+    # 반환할 chunk 의 대략적인 토큰 수 상한 (없으면 n_results 개 전부)
+    token_budget: Optional[int] = None
+    # hybrid: BM25 + 벡터 (질문 단어가 그대로 있으면 임베딩 생략), vector / lexical: 한쪽만
+    retrieval: Optional[Literal["hybrid", "vector", "lexical"]] = "hybrid"
 
 
-# ------------------------
-# skill_order 빈도 기반 정리
-# ------------------------
-def reorder_skill_order(skills: List[str]) -> List[str]:
-    filtered = [s for s in skills if s != 'R']
-    count = Counter(filtered)
-    sorted_skills = [skill for skill, _ in count.most_common()]
-    # 누락된 스킬(Q/W/E) 추가
-    for s in ['Q','W','E']:
-        if s not in sorted_skills:
-            sorted_skills.append(s)
-    return sorted_skills
-
-
-# ------------------------
-# 간단 웹 검색 스크랩 (DuckDuckGo 비공식 JSON 엔드포인트)
-# ------------------------
-def scrape_search(champion: str, question: str, n_results: int = 3) -> List[dict]:
-    query = f"{champion} {question}"
-    url = "https://ddg-webapp-aagd.vercel.app/search"
-    params = {"q": query, "max_results": n_results}
-
-    try:
-        resp = requests.get(url, params=params, timeout=8)
-        resp.raise_for_status()
-        data = resp.json()
-        results = []
-        for item in data:
-            results.append({
-                "title": item.get("title"),
-                "url": item.get("href"),
-                "snippet": item.get("body"),
-                "source": "duckduckgo",
-            })
-        return results
-    except Exception as e:
-        logger.warning(f"search scrape error: {e}")
-        return []
+class RagResponse(BaseModel):
+    source: str
+    documents: List[str]
+    retrieval: Optional[str] = None
+    refreshing: bool
 
 
 # ------------------------
 # Main RAG Route (Gemini 제거)
 # ------------------------
-@router.post("")
-def rag(req: RagRequest):
+# response_model 이 있으면 FastAPI 가 dict 변환 없이 Pydantic 으로 바로 JSON bytes 직렬화
+@router.post("", response_model=RagResponse)
+async def rag(req: RagRequest):
     champion = req.champion
 
     # 한글 챔프이면 영어로 변환
@@ -78,62 +46,30 @@ def rag(req: RagRequest):
     n = req.n_results
 
     # ----------------------------
-    # 1) 기존 Vector Search
+    # 1) 자동 동기화: DDragon + FOW + Search
+    #    - 이 질문에 필요한데 저장된 적 없는 소스(FOW, 이 질문의 검색 결과 등)는 이번 요청에서 수집 (소스별 deadline 내)
+    #    - 오래된/패치가 바뀐/force_refresh 소스는 백그라운드에서 갱신
     # ----------------------------
-    search_res = search_champion(champion, question, n_results=n)
-    try:
-        docs = search_res.get("documents", [[]])[0]
-    except:
-        docs = []
+    refreshing = await sync_champion(champion, question, n, force=bool(req.force_refresh))
 
     # ----------------------------
-    # 2) 자동 동기화: DDragon + FOW + Search
+    # 2) Vector Search (요청 경로는 Chroma 만 읽음)
     # ----------------------------
-    new_data = {}
-
-    # DDragon
-    try:
-        dd = fetch_champion_ddragon(champion)
-        if dd:
-            new_data["ddragon"] = dd
-    except Exception as e:
-        logger.warning(f"ddragon fetch error: {e}")
-
-    # FOW
+    search_res = await asyncio.to_thread(
+        search_champion, champion, question,
+        n_results=n, token_budget=req.token_budget, mode=req.retrieval or "hybrid",
+    )
     try:
-        fow = crawl_fow(champion.lower())
-        if fow.get("skill_order"):
-            fow["skill_order"] = reorder_skill_order(fow["skill_order"])
-        print("=== fow 크롤링 결과 ===")
-        print(fow)
-        if fow:
-            new_data["FOW"] = fow
-    except Exception as e:
-        logger.warning(f"fow fetch error: {e}")
-
-    # Web Search
-    try:
-        web = scrape_search(champion, question, n_results=n)
-        if web:
-            new_data["search"] = web
-    except Exception as e:
-        logger.warning(f"web search error: {e}")
-
-    # ----------------------------
-    # 3) DB 업데이트 (JSON 문자열로 저장)
-    # ----------------------------
-    if new_data:
-        store_champion_data(
-            champion,
-            {"auto_sync": json.dumps(new_data, ensure_ascii=False, indent=2)},
-            "auto_sync"
-        )
-        docs.append(new_data)
+        docs = search_res.get("documents", [[]])[0]
+    except:
+        docs = []
 
     # ----------------------------
-    # 4) 요약 제거 → 원본 docs만 반환
+    # 3) 요약 제거 → 원본 docs만 반환
     # ----------------------------
     return {
         "source": "vector+auto_sync",
-        "documents": docs
+        "documents": docs,
+        "retrieval": search_res.get("mode"),
+        "refreshing": refreshing,
     }
@@ -0,0 +1,21 @@
+from fastapi import APIRouter
+from utils.riot.base import get_pool_stats, RATE_LIMITER, SINGLE_FLIGHT
+from utils.riot.match import MATCH_STORE
+from utils.riot.account import ACCOUNT_CACHE
+from utils.riot.league import LEAGUE_CACHE
+from utils.docs.store import INGEST_QUEUE, EMBED_CACHE, search_stats
+router = APIRouter()
+
+@router.get("/riot")
+async def get_riot_stats():
+    return {
+        "pool": get_pool_stats(),
+        "rate_limit": RATE_LIMITER.stats(),
+        "single_flight": SINGLE_FLIGHT.stats(),
+        "match_store": MATCH_STORE.stats(),
+        "account_cache": ACCOUNT_CACHE.stats(),
+        "league_cache": LEAGUE_CACHE.stats(),
+        "chroma_ingest": INGEST_QUEUE.stats(),
+        "embedding_cache": EMBED_CACHE.stats(),
+        "rag_search": search_stats(),
+    }
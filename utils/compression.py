@@ -0,0 +1,127 @@
+# utils/compression.py
+import asyncio
+import gzip
+
+try:
+    import brotli
+except ImportError:  # brotli 가 없으면 gzip 만 사용
+    brotli = None
+
+# 스트리밍(NDJSON / SSE)은 한 줄씩 바로 보내야 하므로 압축하지 않음
+SKIP_CONTENT_TYPES = ("text/event-stream", "application/x-ndjson")
+
+
+def _accepted(header: str) -> dict[str, float]:
+    """
+    "br;q=1.0, gzip;q=0.8, *;q=0.1" -> {"br": 1.0, "gzip": 0.8, "*": 0.1}
+    """
+    accepted = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[name.strip().lower()] = q
+    return accepted
+
+
+def negotiate(header: str) -> str | None:
+    """
+    Accept-Encoding 에서 쓸 인코딩 선택 (br > gzip, q=0 은 거부)
+    """
+    accepted = _accepted(header)
+    for encoding in ("br", "gzip"):
+        if encoding == "br" and brotli is None:
+            continue
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > 0:
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Accept-Encoding 에 따라 brotli / gzip 으로 응답 본문 압축 (ASGI 미들웨어)
+    - 본문이 한 번에 오는 응답만, minimum_size 바이트 이상일 때만 압축
+    - 스트리밍 응답 / 이미 인코딩된 응답은 그대로 전달
+    - thread_minimum_size 이상은 스레드에서 압축 (이벤트 루프를 막지 않도록)
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4,
+                 thread_minimum_size: int = 256 * 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.thread_minimum_size = thread_minimum_size
+
+    def _compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        encoding = negotiate(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                # 본문을 보고 결정해야 하므로 헤더는 첫 본문 메시지까지 보류
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            response_headers = [(k.lower(), v) for k, v in start.get("headers", [])]
+            content_type = next((v for k, v in response_headers if k == b"content-type"), b"").decode("latin-1")
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or any(k == b"content-encoding" for k, _ in response_headers)
+                or content_type.startswith(SKIP_CONTENT_TYPES)
+            ):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            if len(body) >= self.thread_minimum_size:
+                compressed = await asyncio.to_thread(self._compress, encoding, body)
+            else:
+                compressed = self._compress(encoding, body)
+            response_headers = [(k, v) for k, v in response_headers if k != b"content-length"]
+            vary = [v for k, v in response_headers if k == b"vary"]
+            response_headers = [(k, v) for k, v in response_headers if k != b"vary"]
+            vary_value = b", ".join([*vary, b"Accept-Encoding"]) if vary else b"Accept-Encoding"
+            response_headers += [
+                (b"content-encoding", encoding.encode()),
+                (b"content-length", str(len(compressed)).encode()),
+                (b"vary", vary_value),
+            ]
+            await send({**start, "headers": response_headers})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
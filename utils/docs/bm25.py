@@ -0,0 +1,121 @@
+# utils/docs/bm25.py
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import List, NamedTuple
+
+# 영문/숫자 단어, 한글 음절 덩어리
+_TOKEN = re.compile(r"[a-z0-9]+|[가-힣]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    영문/숫자는 단어 단위, 한글은 음절 bigram
+    (조사/어미가 붙어도 "아이템빌드을" → "아이", "이템", "템빌", ... 로 겹치도록)
+    """
+    tokens = []
+    for run in _TOKEN.findall(text.lower()):
+        if "가" <= run[0] <= "힣" and len(run) > 1:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+
+class Hit(NamedTuple):
+    doc_id: str
+    score: float
+    # 질문 토큰 중 문서에 있는 비율
+    coverage: float
+
+
+class BM25Index:
+    """
+    champion 필터가 있는 메모리 BM25 역색인
+    - 문서 통계(문서 수, 평균 길이, df)는 전체 문서 기준
+    - 검색은 같은 champion 문서만
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        # term -> doc id -> tf
+        self._postings: dict[str, dict[str, int]] = defaultdict(dict)
+        # doc id -> (champion, 길이, term 목록)
+        self._docs: dict[str, tuple[str, int, list[str]]] = {}
+        # doc id -> (본문, 메타데이터)
+        self._entries: dict[str, tuple[str, dict]] = {}
+        self._total_len = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def _remove(self, doc_id: str):
+        entry = self._docs.pop(doc_id, None)
+        if entry is None:
+            return
+        _, length, terms = entry
+        self._total_len -= length
+        for term in terms:
+            postings = self._postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+        self._entries.pop(doc_id, None)
+
+    def add(self, doc_id: str, text: str, metadata: dict):
+        tokens = tokenize(text)
+        counts = Counter(tokens)
+        with self._lock:
+            self._remove(doc_id)
+            for term, tf in counts.items():
+                self._postings[term][doc_id] = tf
+            self._docs[doc_id] = (metadata.get("champion") or "", len(tokens), list(counts))
+            self._entries[doc_id] = (text, metadata)
+            self._total_len += len(tokens)
+
+    def remove(self, doc_id: str):
+        with self._lock:
+            self._remove(doc_id)
+
+    def get(self, doc_id: str) -> tuple[str, dict] | None:
+        return self._entries.get(doc_id)
+
+    def search(self, query: str, n: int, champion: str) -> List[Hit]:
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        with self._lock:
+            total = len(self._docs)
+            if not total:
+                return []
+            avg_len = self._total_len / total
+            scores: dict[str, float] = defaultdict(float)
+            matched: dict[str, int] = defaultdict(int)
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    doc_champion, length, _ = self._docs[doc_id]
+                    if doc_champion != champion:
+                        continue
+                    norm = self.k1 * (1 - self.b + self.b * length / avg_len)
+                    scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+                    matched[doc_id] += 1
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:n]
+        return [Hit(doc_id, score, matched[doc_id] / len(terms)) for doc_id, score in ranked]
+
+
+def rrf_fuse(rankings: List[List[str]], k: int = 60) -> List[tuple[str, float]]:
+    """
+    Reciprocal Rank Fusion: 각 순위 목록에서 1 / (k + 순위) 를 더함
+    """
+    scores: dict[str, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] += 1 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
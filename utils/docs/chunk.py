@@ -0,0 +1,93 @@
+# utils/docs/chunk.py
+import hashlib
+from typing import Dict, List
+
+# 소스 데이터 → 검색 단위 chunk
+# section -> {"text": 본문, 나머지는 Chroma 메타데이터 (str 값만)}
+# 한 소스 안에서 section 이름이 고정이라 같은 chunk 는 같은 id 로 upsert 됨
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토크나이저 없이 대략적인 토큰 수: 영문/숫자는 4자당 1, 한글 등 비ASCII 는 1자당 1
+    """
+    ascii_chars = sum(1 for ch in text if ch.isascii())
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def chunk_ddragon(champion: str, sections: Dict[str, str]) -> Dict[str, dict]:
+    """
+    champion_sections 결과 → 기본 / 능력치 / 스킬별 chunk ("full" 은 나머지의 합이라 저장하지 않음)
+    """
+    chunks = {}
+    if sections.get("basic"):
+        chunks["basic"] = {"text": f"{champion} [기본]\n{sections['basic']}", "kind": "basic"}
+    if sections.get("stats"):
+        chunks["stats"] = {"text": f"{champion} [능력치]\n{sections['stats']}", "kind": "stats"}
+    # champion_sections 는 스킬을 빈 줄로 구분해서 이어 붙임
+    spells = [s for s in (sections.get("skills") or "").split("\n\n") if s.strip()]
+    for i, spell in enumerate(spells):
+        chunks[f"skills#{i}"] = {"text": f"{champion} [스킬]\n{spell}", "kind": "skill"}
+    return chunks
+
+
+def chunk_fow(champion: str, fow: dict) -> Dict[str, dict]:
+    """
+    FOW 통계 → 룬 / 아이템 빌드 / 스킬 순서 chunk
+    """
+    chunks = {}
+    runes = fow.get("runes") or {}
+    lines = [
+        f"{label}: {', '.join(runes[key])}"
+        for key, label in (("primary", "주 룬"), ("secondary", "부 룬"), ("shard", "파편"))
+        if runes.get(key)
+    ]
+    if lines:
+        chunks["runes"] = {"text": f"{champion} [룬]\n" + "\n".join(lines), "kind": "runes"}
+    if fow.get("build"):
+        chunks["build"] = {"text": f"{champion} [아이템 빌드]\n" + " → ".join(fow["build"]), "kind": "build"}
+    if fow.get("skill_order"):
+        chunks["skill_order"] = {
+            "text": f"{champion} [스킬 선마 순서]\n" + " > ".join(fow["skill_order"]),
+            "kind": "skill_order",
+        }
+    return chunks
+
+
+def chunk_search(champion: str, query: str, results: List[dict]) -> Dict[str, dict]:
+    """
+    검색 결과 → 결과(snippet)마다 chunk
+    section 은 결과 URL(없으면 본문)의 해시라 다른 질문에서 같은 결과가 나와도 문서 하나로 합쳐짐
+    query: 이 결과를 가져온 질문 section (재수집 주기 / 정리 기준)
+    """
+    chunks = {}
+    for item in results:
+        title = item.get("title") or ""
+        snippet = item.get("snippet") or ""
+        if not (title or snippet):
+            continue
+        url = item.get("url") or ""
+        text = f"{champion} [검색] {title}\n{snippet}".strip()
+        section = "r:" + hashlib.sha1((url or text).encode()).hexdigest()[:12]
+        chunks[section] = {
+            "text": text,
+            "kind": "snippet",
+            "title": title,
+            "url": url,
+            "query": query,
+        }
+    return chunks
+
+
+def within_budget(documents: List[str], token_budget: int | None) -> int:
+    """
+    순위 순서대로 token_budget 안에 들어가는 문서 개수 (최소 1개)
+    """
+    if token_budget is None:
+        return len(documents)
+    used = 0
+    for i, doc in enumerate(documents):
+        used += estimate_tokens(doc)
+        if used > token_budget:
+            return max(i, 1)
+    return len(documents)
@@ -1,36 +1,156 @@
-import requests
 import os
+import re
+import json
+import time
+import tempfile
+import asyncio
+import logging
 from typing import Dict
 from dotenv import load_dotenv
+from utils.docs.http import get_client
+from utils.metrics import timed
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # optional: use env to pin ddragon version, otherwise fetch latest
-DDRAGON_CDN = "https://ddragon.leagueoflegends.com"
+# 로컬 스텁 서버로 돌릴 때는 DDRAGON_CDN 으로 덮어씀
+DDRAGON_CDN = os.getenv("DDRAGON_CDN", "https://ddragon.leagueoflegends.com")
+
+# DDragon 파일 디스크 캐시 (버전별 파일은 내용이 바뀌지 않으므로 한 번 받으면 재사용)
+CACHE_DIR = os.getenv("DDRAGON_CACHE_DIR", "./ddragon_cache")
+# versions.json 재확인 주기 (초)
+VERSION_TTL = float(os.getenv("DDRAGON_VERSION_TTL", "600"))
+
+# DDragon 챔피언 key ("Kassadin", "MonkeyKing") / 패치 버전 ("15.20.1") 형식
+# 요청 본문의 챔피언 이름이 URL / 캐시 경로에 그대로 들어가므로 이 형식만 허용
+_CHAMPION_KEY = re.compile(r"[A-Za-z0-9]+")
+_VERSION = re.compile(r"[0-9]+(\.[0-9]+)*")
+
+# 최신 버전 메모리 캐시
+_version = {"value": None, "checked_at": 0.0, "refreshing": None}
+
+def _read_json(path: str):
+    with open(path, "rb") as f:
+        return json.loads(f.read())
+
+def _write_cache(path: str, body: bytes, meta: dict):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # 쓰다가 중단돼도 깨진 파일이 남지 않도록 임시 파일에 쓰고 교체
+    # (같은 파일을 동시에 받아도 서로의 임시 파일을 건드리지 않도록 매번 고유한 이름)
+    for target, content in ((path, body), (path + ".meta", json.dumps(meta).encode())):
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target), prefix=os.path.basename(target) + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp, target)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+def _cache_path(relpath: str) -> str:
+    """
+    CACHE_DIR 아래의 절대 경로 (relpath 가 CACHE_DIR 밖을 가리키면 ValueError)
+    """
+    root = os.path.realpath(CACHE_DIR)
+    path = os.path.realpath(os.path.join(root, relpath))
+    if os.path.commonpath([root, path]) != root:
+        raise ValueError(f"ddragon cache path escapes {CACHE_DIR}: {relpath}")
+    return path
+
+async def _cached_get(url: str, relpath: str, revalidate: bool = False, timeout: float = 10, operation: str = ""):
+    """
+    디스크 캐시를 거쳐 DDragon JSON 가져오기
+    - revalidate=False: 캐시에 있으면 네트워크 없이 반환 (버전별 파일)
+    - revalidate=True: ETag / Last-Modified 로 조건부 요청, 304 면 캐시 사용
+    - 네트워크 실패 시 캐시가 있으면 캐시 반환 (오프라인 대비)
+    """
+    path = _cache_path(relpath)
+    cached = os.path.exists(path)
+    if cached and not revalidate:
+        return await asyncio.to_thread(_read_json, path)
 
-def _get_latest_version() -> str:
+    headers = {}
+    if cached and os.path.exists(path + ".meta"):
+        meta = await asyncio.to_thread(_read_json, path + ".meta")
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        with timed("ddragon", operation):
+            resp = await get_client().get(url, headers=headers, timeout=timeout)
+        if resp.status_code == 304 and cached:
+            return await asyncio.to_thread(_read_json, path)
+        resp.raise_for_status()
+        data = resp.json()
+    except Exception as e:
+        if not cached:
+            raise
+        logger.warning(f"ddragon fetch failed, serving cached {relpath}: {e}")
+        return await asyncio.to_thread(_read_json, path)
+
+    meta = {"etag": resp.headers.get("ETag"), "last_modified": resp.headers.get("Last-Modified"), "url": url}
+    await asyncio.to_thread(_write_cache, path, resp.content, meta)
+    return data
+
+async def _refresh_version() -> str:
     try:
-        versions = requests.get(f"{DDRAGON_CDN}/api/versions.json", timeout=5).json()
-        return versions[0]
+        versions = await _cached_get(f"{DDRAGON_CDN}/api/versions.json", "versions.json", revalidate=True, timeout=5, operation="versions")
+        version = versions[0]
     except Exception:
-        return os.getenv("DDRAGON_VERSION", "14.5.1")  # fallback
+        version = _version["value"] or os.getenv("DDRAGON_VERSION", "14.5.1")  # fallback
+    _version["value"] = version
+    _version["checked_at"] = time.monotonic()
+    return version
 
-def fetch_champion_ddragon(champion: str) -> Dict[str,str]:
+async def get_latest_version() -> str:
+    """
+    최신 DDragon 버전 (VERSION_TTL 마다 백그라운드에서 재확인, 처음 한 번만 대기)
+    """
+    if _version["value"] is None:
+        return await _refresh_version()
+    if time.monotonic() - _version["checked_at"] > VERSION_TTL and _version["refreshing"] is None:
+        task = asyncio.create_task(_refresh_version())
+        _version["refreshing"] = task
+        task.add_done_callback(lambda _: _version.update(refreshing=None))
+    return _version["value"]
+
+async def fetch_champion_ddragon(champion: str, version: str | None = None) -> Dict[str,str]:
     """
     return dict with keys: basic, stats, skills, full
     champion should be champion key like 'Kassadin' (capitalized)
+    version: 이미 알고 있는 패치 버전 (없으면 최신 버전 조회)
     """
-    ver = _get_latest_version()
+    if not _CHAMPION_KEY.fullmatch(champion):
+        # DDragon 에 없는 형식의 이름 (경로 조작 방지)
+        logger.warning(f"invalid champion key for ddragon: {champion!r}")
+        return {}
+    ver = version or await get_latest_version()
+    if not _VERSION.fullmatch(ver):
+        raise ValueError(f"invalid ddragon version: {ver!r}")
     base = f"{DDRAGON_CDN}/cdn/{ver}/data/en_US/champion"
     url = f"{base}/{champion}.json"
-    print(champion)
-    r = requests.get(url, timeout=10)
-    r.raise_for_status()
-    data = r.json()
+    data = await _cached_get(url, os.path.join(ver, "champion", f"{champion}.json"), operation="champion")
     champ_data = data["data"].get(champion)
     if not champ_data:
         return {}
+    return champion_sections(champ_data)
+
+async def fetch_champion_full(version: str) -> Dict[str, dict]:
+    """
+    패치의 전체 챔피언 데이터 (championFull.json) 한 번에 받기
+    return: champion key -> champion data
+    """
+    if not _VERSION.fullmatch(version):
+        raise ValueError(f"invalid ddragon version: {version!r}")
+    url = f"{DDRAGON_CDN}/cdn/{version}/data/en_US/championFull.json"
+    data = await _cached_get(url, os.path.join(version, "championFull.json"), timeout=30, operation="champion_full")
+    return data["data"]
 
+def champion_sections(champ_data: dict) -> Dict[str,str]:
     basic_text = champ_data.get("blurb", "")
     stats = champ_data.get("stats", {})
     stats_text = "\n".join([f"{k}: {v}" for k, v in stats.items()])
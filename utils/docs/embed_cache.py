@@ -0,0 +1,98 @@
+# utils/docs/embed_cache.py
+import hashlib
+import sqlite3
+import threading
+import unicodedata
+from typing import Callable, List
+
+import numpy as np
+
+from utils.lru_store import LRUTable
+
+
+def normalize_text(text: str) -> str:
+    # 임베딩 결과가 달라지지 않는 차이(유니코드 조합형, 공백)만 정규화
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class EmbeddingCache:
+    """
+    (모델 id, 정규화한 텍스트 해시) -> float32 임베딩
+    - 메모리 LRU (max_memory 개) → SQLite (max_rows 개) 순서로 조회 (LRUTable)
+    - 임베딩은 스레드에서 호출되므로 동기 API + threading lock
+    """
+
+    def __init__(self, path: str, model_id: str, max_memory: int = 1024, max_rows: int = 20000):
+        self.path = path
+        self.model_id = model_id
+        self._lru = LRUTable("embeddings", "key", "vector", max_memory, max_rows)
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def key(self, text: str) -> str:
+        return hashlib.sha1(f"{self.model_id}\0{normalize_text(text)}".encode()).hexdigest()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, model TEXT NOT NULL, vector BLOB NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._lru.attach(conn)
+            self._conn = conn
+        return self._conn
+
+    def get_many(self, keys: List[str]) -> dict[str, np.ndarray]:
+        with self._lock:
+            found, missing = self._lru.lookup(keys)
+            if missing:
+                for key, blob in self._lru.load(self._db(), missing):
+                    vector = np.frombuffer(blob, dtype=np.float32)
+                    self._lru.remember(key, vector)
+                    found[key] = vector
+        return found
+
+    def put_many(self, vectors: dict[str, np.ndarray]):
+        with self._lock:
+            items = []
+            for key, vector in vectors.items():
+                vector = np.asarray(vector, dtype=np.float32)
+                self._lru.remember(key, vector)
+                items.append((key, vector.tobytes()))
+            self._lru.save(self._db(), items, model=self.model_id)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> dict:
+        return {**self._lru.stats(), "model": self.model_id}
+
+
+class CachedEmbedder:
+    """
+    Chroma embedding function 을 감싸 캐시에 없는 텍스트만 모델에 넘김
+    (같은 호출 안의 중복 텍스트도 한 번만 임베딩)
+    """
+
+    def __init__(self, embed: Callable[[List[str]], list], cache: EmbeddingCache):
+        self.embed = embed
+        self.cache = cache
+
+    def __call__(self, texts: List[str]) -> List[np.ndarray]:
+        keys = [self.cache.key(text) for text in texts]
+        found = self.cache.get_many(keys)
+        todo = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                todo.setdefault(key, text)
+        if todo:
+            vectors = self.embed(list(todo.values()))
+            computed = {key: np.asarray(vector, dtype=np.float32) for key, vector in zip(todo, vectors)}
+            self.cache.put_many(computed)
+            found.update(computed)
+        return [found[key] for key in keys]
@@ -1,88 +1,87 @@
-import requests
-from bs4 import BeautifulSoup
+import os
+import re
+import html
+import asyncio
 from collections import Counter
+from selectolax.lexbor import LexborHTMLParser
+from utils.docs.http import get_client
+from utils.metrics import timed
 
-def crawl_fow(champion: str):
-    url = f"https://www.fow.lol/stats/{champion}"
-    html = requests.get(url, headers={"User-Agent": "Mozilla/5.0"}).text
-    soup = BeautifulSoup(html, "html.parser")
+# 로컬 스텁 서버로 돌릴 때는 FOW_BASE_URL 로 덮어씀
+FOW_BASE_URL = os.getenv("FOW_BASE_URL", "https://www.fow.lol")
 
-    primary_runes = []
-    secondary_runes = []
-    shard_runes = []
-    item_build = []
+# tipsy 속성 안 첫 <span> 내용 (룬 이름)
+_TIPSY_SPAN = re.compile(r"<span\b[^>]*>(.*?)</span>", re.S | re.I)
+# 태그만 제거 ("<집중 공격>" 처럼 꺾쇠로 감싼 한글 텍스트는 남김)
+_TAG = re.compile(r"</?[a-zA-Z][^>]*>")
 
-    for div in soup.find_all("div"):
-        style = div.get("style", "")
+async def crawl_fow(champion: str):
+    url = f"{FOW_BASE_URL}/stats/{champion}"
+    with timed("fow", "fetch"):
+        resp = await get_client().get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=10)
+    resp.raise_for_status()
+    # HTML 파싱은 CPU 작업이라 이벤트 루프를 막지 않도록 스레드에서 실행
+    with timed("fow", "parse"):
+        return await asyncio.to_thread(parse_fow, resp.text)
 
-        # -----------------------
-        # 주 룬: width 116px
-        # -----------------------
-        if "width: 116px" in style:
-            if len(primary_runes) < 4:
-                imgs = div.select("img.antiBorder")
-                for img in imgs:
-                    tipsy_html = img.get("tipsy", "")
-                    # BeautifulSoup로 HTML 파싱 후 <span> 안 텍스트 추출
-                    tipsy_soup = BeautifulSoup(tipsy_html, "html.parser")
-                    span = tipsy_soup.find("span")
-                    if span:
-                        rune_name = span.get_text(strip=True).strip("<> ")  # "집중 공격" 등
-                        primary_runes.append(rune_name)
-        # -----------------------
-        # 부 룬: width 100px
-        # -----------------------
-        elif "width: 100px" in style:
-            if len(secondary_runes) < 3:
-                imgs = div.select("img.antiBorder")
-                for img in imgs:
-                    tipsy_html = img.get("tipsy", "")
-                    # BeautifulSoup로 HTML 파싱 후 <span> 안 텍스트 추출
-                    tipsy_soup = BeautifulSoup(tipsy_html, "html.parser")
-                    span = tipsy_soup.find("span")
-                    if span:
-                        rune_name = span.get_text(strip=True).strip("<> ")  # "집중 공격" 등
-                        secondary_runes.append(rune_name)
+def _tipsy_name(tipsy: str) -> str | None:
+    # tipsy 조각마다 HTML 파서를 새로 만들지 않고 정규식으로 <span> 텍스트만 추출
+    match = _TIPSY_SPAN.search(tipsy)
+    if not match:
+        return None
+    text = html.unescape(_TAG.sub("", match.group(1))).strip()
+    return text.strip("<> ") or None
 
-        # -----------------------
-        # 파편: width 68px
-        # -----------------------
-        elif "width: 68px" in style:
-            if len(shard_runes) < 2:
-                imgs = div.select("img.antiBorder")
-                for img in imgs:
-                    tipsy_html = img.get("tipsy", "")
-                    # BeautifulSoup로 HTML 파싱 후 <span> 안 텍스트 추출
-                    tipsy_soup = BeautifulSoup(tipsy_html, "html.parser")
-                    span = tipsy_soup.find("span")
-                    if span:
-                        rune_name = span.get_text(strip=True).strip("<> ")  # "집중 공격" 등
-                        shard_runes.append(rune_name)
+def _rune_names(tree, style: str, limit: int) -> list[str]:
+    names = []
+    for div in tree.css(f'div[style*="{style}"]'):
+        # 기존 동작과 같이 div 단위로 상한 확인 (div 안의 룬은 모두 추가)
+        if len(names) >= limit:
+            break
+        for img in div.css("img.antiBorder"):
+            name = _tipsy_name(img.attributes.get("tipsy") or "")
+            if name:
+                names.append(name)
+    return names
 
+def parse_fow(page: str):
+    tree = LexborHTMLParser(page)
 
-        elif "width:128px" in style:
-            title_span = div.find("span", class_="summary_title")
-            if title_span and "아이템 빌드" in title_span.get_text():
-                imgs = div.select("div.content_full img.tipsy_live.item_icon")
-                for img in imgs:
-                    item_name = img.get("alt", "").strip()
-                    if item_name and len(item_build) < 3:
-                        item_build.append(item_name)
-    skill_order = []
+    # -----------------------
+    # 주 룬: width 116px / 부 룬: width 100px / 파편: width 68px
+    # -----------------------
+    primary_runes = _rune_names(tree, "width: 116px", 4)
+    secondary_runes = _rune_names(tree, "width: 100px", 3)
+    shard_runes = _rune_names(tree, "width: 68px", 2)
 
-    # 테이블 찾기
-    for table in soup.find_all("table", style=lambda s: s and "width:250px" in s):
-        if len(skill_order) <= 0:
-            for tr in table.find_all("tr"):
-                tds = tr.find_all("td")
-                if len(tds) < 2:
-                    continue
-                # 두 번째 td.rskill_build_c가 실제 스킬명
-                skill_name = tds[1].get_text(strip=True)
-                # 레벨별 우선순위 컬럼만 선택
-                priority_cells = [td for td in tds[2:] if 'rskill_build' in td.get('class', [])]
-                for _ in range(len(priority_cells)):
-                    skill_order.append(skill_name)
+    # -----------------------
+    # 아이템 빌드: width:128px 중 제목이 "아이템 빌드" 인 블록
+    # -----------------------
+    item_build = []
+    for div in tree.css('div[style*="width:128px"]'):
+        title_span = div.css_first("span.summary_title")
+        if title_span and "아이템 빌드" in title_span.text():
+            for img in div.css("div.content_full img.tipsy_live.item_icon"):
+                item_name = (img.attributes.get("alt") or "").strip()
+                if item_name and len(item_build) < 3:
+                    item_build.append(item_name)
+
+    # -----------------------
+    # 스킬 순서: width:250px 테이블
+    # -----------------------
+    skill_order = []
+    for table in tree.css('table[style*="width:250px"]'):
+        if skill_order:
+            break
+        for tr in table.css("tr"):
+            tds = tr.css("td")
+            if len(tds) < 2:
+                continue
+            # 두 번째 td.rskill_build_c가 실제 스킬명
+            skill_name = tds[1].text(strip=True)
+            # 레벨별 우선순위 컬럼만 선택
+            priority_cells = [td for td in tds[2:] if "rskill_build" in (td.attributes.get("class") or "").split()]
+            skill_order.extend([skill_name] * len(priority_cells))
     filtered_skills = [s for s in skill_order if s != 'R']
 
     # 빈도 계산
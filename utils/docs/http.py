@@ -0,0 +1,25 @@
+# utils/docs/http.py
+import httpx
+
+# DDragon / FOW / 검색이 같이 쓰는 공유 클라이언트 (lifespan 에서 열고 닫음)
+_client: httpx.AsyncClient | None = None
+
+TIMEOUT = httpx.Timeout(10, connect=5)
+LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30)
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    공유 클라이언트 반환 (lifespan 밖에서 호출되면 지연 생성)
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(timeout=TIMEOUT, limits=LIMITS, follow_redirects=True)
+    return _client
+
+
+async def close_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
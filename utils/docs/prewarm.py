@@ -0,0 +1,73 @@
+# utils/docs/prewarm.py
+import os
+import asyncio
+import logging
+from dotenv import load_dotenv
+
+from utils.docs.store import store_champion_batch, get_patched_champions
+from utils.docs.ddragon import get_latest_version, fetch_champion_full, champion_sections
+from utils.docs.chunk import chunk_ddragon
+from utils.riot.base import SHARED_STATE
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# 새 패치 확인 주기 (초)
+PREWARM_INTERVAL = float(os.getenv("DDRAGON_PREWARM_INTERVAL", "3600"))
+# 서버 시작 직후 요청 처리와 겹치지 않도록 첫 확인 전 대기 (초)
+PREWARM_DELAY = float(os.getenv("DDRAGON_PREWARM_DELAY", "10"))
+# 한 번에 임베딩할 챔피언 수 / 동시에 진행할 배치 수
+PREWARM_BATCH_SIZE = int(os.getenv("DDRAGON_PREWARM_BATCH_SIZE", "16"))
+PREWARM_CONCURRENCY = int(os.getenv("DDRAGON_PREWARM_CONCURRENCY", "2"))
+
+
+async def prewarm_patch(version: str) -> int:
+    """
+    championFull.json 을 한 번 받아 챔피언별 ddragon 문서로 나눠 배치 저장
+    - 이미 이 패치로 저장된 챔피언은 건너뜀 (중단된 작업은 다음 실행에서 이어서 진행)
+    :return: 새로 저장한 챔피언 수
+    """
+    champions = await fetch_champion_full(version)
+    done = await asyncio.to_thread(get_patched_champions, "ddragon", version)
+    todo = [(key, data) for key, data in champions.items() if key.lower() not in done]
+    if not todo:
+        return 0
+
+    # sync.py 의 ddragon 문서와 같은 chunk
+    items = [(key, chunk_ddragon(key, champion_sections(data))) for key, data in todo]
+    batches = [items[i:i + PREWARM_BATCH_SIZE] for i in range(0, len(items), PREWARM_BATCH_SIZE)]
+    semaphore = asyncio.Semaphore(PREWARM_CONCURRENCY)
+
+    async def store(batch):
+        async with semaphore:
+            await asyncio.to_thread(store_champion_batch, batch, "ddragon", version)
+
+    await asyncio.gather(*[store(batch) for batch in batches])
+    logger.info(f"[prewarm] stored {len(items)} champions for patch {version}")
+    return len(items)
+
+
+async def run_prewarm_scheduler():
+    """
+    주기적으로 최신 DDragon 버전을 확인하고, 바뀌면 전체 챔피언 문서를 미리 저장
+    (lifespan 에서 백그라운드 태스크로 실행)
+    - worker 가 여럿이면 (공유 상태가 있으면) lease 를 가진 worker 하나만 실행
+      (lease 는 확인할 때마다 연장, 그 worker 가 죽으면 두 주기 뒤 다른 worker 가 이어받음)
+    """
+    await asyncio.sleep(PREWARM_DELAY)
+    warmed = None
+    while True:
+        try:
+            if SHARED_STATE is not None and not await SHARED_STATE.acquire_lease("ddragon_prewarm", PREWARM_INTERVAL * 2):
+                await asyncio.sleep(PREWARM_INTERVAL)
+                continue
+            version = await get_latest_version()
+            if version != warmed:
+                await prewarm_patch(version)
+                warmed = version
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"[prewarm] failed, retry in {PREWARM_INTERVAL}s: {e}")
+        await asyncio.sleep(PREWARM_INTERVAL)
@@ -0,0 +1,32 @@
+import os
+import logging
+from typing import List
+from utils.docs.http import get_client
+from utils.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+# 간단 웹 검색 스크랩 (DuckDuckGo 비공식 JSON 엔드포인트, 로컬 스텁 서버로 돌릴 때는 SEARCH_URL 로 덮어씀)
+SEARCH_URL = os.getenv("SEARCH_URL", "https://ddg-webapp-aagd.vercel.app/search")
+
+async def scrape_search(champion: str, question: str, n_results: int = 3) -> List[dict]:
+    query = f"{champion} {question}"
+    params = {"q": query, "max_results": n_results}
+
+    try:
+        with timed("search", "query"):
+            resp = await get_client().get(SEARCH_URL, params=params, timeout=8)
+        resp.raise_for_status()
+        data = resp.json()
+        results = []
+        for item in data:
+            results.append({
+                "title": item.get("title"),
+                "url": item.get("href"),
+                "snippet": item.get("body"),
+                "source": "duckduckgo",
+            })
+        return results
+    except Exception as e:
+        logger.warning(f"search scrape error: {e}")
+        return []
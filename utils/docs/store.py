@@ -1,10 +1,16 @@
 # utils/store.py
-import chromadb
-from chromadb.utils import embedding_functions
 import os
-from typing import Dict
+import time
+import asyncio
+import hashlib
+import threading
+from typing import Dict, List, Tuple
 import logging
 from dotenv import load_dotenv
+from utils.docs.embed_cache import EmbeddingCache, CachedEmbedder
+from utils.docs.chunk import within_budget
+from utils.docs.bm25 import BM25Index, rrf_fuse
+from utils.metrics import record_queue_wait, timed
 
 load_dotenv()
 
@@ -12,31 +18,153 @@ logger = logging.getLogger(__name__)
 
 # 저장될 위치
 PERSIST_DIR = os.getenv("CHROMA_PERSIST", "./chroma_db")
+# Chroma 서버 주소 (worker 가 여럿이면 지정: 로컬 PersistentClient 는 프로세스끼리 쓰기/벡터 인덱스를 공유하지 않음)
+CHROMA_HOST = os.getenv("CHROMA_HOST", "")
+CHROMA_PORT = int(os.getenv("CHROMA_PORT", "8000"))
 
-# 최신 Chroma 방식
-client = chromadb.PersistentClient(path=PERSIST_DIR)
+# Chroma 클라이언트/임베딩 모델/컬렉션은 첫 사용 시점에 생성
+# (chromadb import 와 ONNX 모델 로드가 서버 시작을 늦추지 않도록)
+_client = None
+_embedder = None
+_collection = None
+_init_lock = threading.Lock()
 
-# 기본 embedding function (OPENAI/GEMINI도 붙일 수 있음)
-embedder = embedding_functions.DefaultEmbeddingFunction()
 
-# 컬렉션 생성
-collection = client.get_or_create_collection(
-    name="champion_info",
-    embedding_function=embedder
-)
+def get_collection():
+    global _client, _embedder, _collection
+    if _collection is None:
+        with _init_lock:
+            if _collection is None:
+                with timed("chroma", "open"):
+                    import chromadb
+                    from chromadb.utils import embedding_functions
+
+                    # 최신 Chroma 방식
+                    if CHROMA_HOST:
+                        _client = chromadb.HttpClient(host=CHROMA_HOST, port=CHROMA_PORT)
+                    else:
+                        _client = chromadb.PersistentClient(path=PERSIST_DIR)
+                    # 기본 embedding function (OPENAI/GEMINI도 붙일 수 있음)
+                    _embedder = embedding_functions.DefaultEmbeddingFunction()
+                    # 컬렉션 생성
+                    collection = _client.get_or_create_collection(
+                        name="champion_info",
+                        embedding_function=_embedder
+                    )
+                    _drop_legacy_documents(collection)
+                    _collection = collection
+    return _collection
 
 
-def store_champion_data(champion: str, data: Dict[str, str], source: str):
+def _drop_legacy_documents(collection):
     """
-    data: dict[section] -> text
+    chunk 도입 전 요청마다 통째로 저장하던 "<champ>::auto_sync::auto_sync" 문서 삭제
+    (지금은 소스별 chunk 로 저장하므로 그대로 두면 검색 결과에 중복으로 섞임)
     """
+    res = collection.get(where={"source": "auto_sync"}, include=[])
+    ids = res.get("ids") or []
+    if ids:
+        collection.delete(ids=ids)
+        logger.info(f"[Chroma] dropped {len(ids)} legacy auto_sync documents")
+
+
+# 같은 문서의 BM25 역색인 (첫 검색 때 Chroma 에서 한 번 읽어 만들고 이후 쓰기/삭제를 반영)
+_lexical: BM25Index | None = None
+_lexical_lock = threading.Lock()
+# 다른 worker 가 쓴 문서를 반영하도록 이 주기(초)마다 컬렉션 문서 수를 확인해서 다르면 다시 만듦 (0 이면 끔)
+LEXICAL_RECHECK = float(os.getenv("RAG_LEXICAL_RECHECK", "0"))
+_lexical_checked = 0.0
+
+# hybrid 에서 각 방식으로 가져올 후보 수 (n_results 배수, 최소값)
+HYBRID_CANDIDATES = int(os.getenv("RAG_HYBRID_CANDIDATES", "4"))
+_search_stats = {"vector": 0, "lexical": 0, "hybrid": 0, "lexical_fast_path": 0}
+
+
+def get_lexical_index() -> BM25Index:
+    global _lexical, _lexical_checked
+    if _lexical is not None and LEXICAL_RECHECK > 0 and time.monotonic() - _lexical_checked > LEXICAL_RECHECK:
+        _lexical_checked = time.monotonic()
+        count = get_collection().count()
+        with _lexical_lock:
+            if _lexical is not None and len(_lexical) != count:
+                _lexical = None
+    if _lexical is None:
+        with _lexical_lock:
+            if _lexical is None:
+                index = BM25Index()
+                res = get_collection().get(include=["documents", "metadatas"])
+                for doc_id, doc, meta in zip(res.get("ids") or [], res.get("documents") or [], res.get("metadatas") or []):
+                    index.add(doc_id, doc or "", meta or {})
+                _lexical = index
+    return _lexical
+
+
+def _index_lexical(ids: List[str], docs: List[str] | None = None, metadatas: List[dict] | None = None):
+    # 아직 역색인을 만들기 전이면 건너뜀 (만들 때 Chroma 에서 전부 읽음)
+    with _lexical_lock:
+        if _lexical is None:
+            return
+        for k, doc_id in enumerate(ids):
+            if docs is None:
+                _lexical.remove(doc_id)
+            else:
+                _lexical.add(doc_id, docs[k], metadatas[k])
+
+
+def _embed_with_model(texts: List[str]):
+    get_collection()
+    with timed("embedding", "model"):
+        return _embedder(texts)
+
+
+def warm_up():
+    """
+    컬렉션을 열고 임베딩 모델을 한 번 실행해 둠 (lifespan 에서 백그라운드로 호출)
+    """
+    started = time.perf_counter()
+    try:
+        _embed_with_model(["warm up"])
+    except Exception as e:
+        # 실패해도 첫 RAG 요청에서 다시 시도
+        logger.warning(f"[Chroma] warm up failed: {e}")
+        return
+    logger.info(f"[Chroma] warmed up in {time.perf_counter() - started:.2f}s")
+
+
+# 임베딩 캐시: 같은 문서/질문은 모델을 다시 돌리지 않음
+# (DefaultEmbeddingFunction 은 all-MiniLM-L6-v2, 모델을 바꾸면 EMBEDDING_MODEL_ID 도 바꿔야 함)
+EMBED_CACHE = EmbeddingCache(
+    os.getenv("EMBED_CACHE_PATH", "./embed_cache.sqlite3"),
+    model_id=os.getenv("EMBEDDING_MODEL_ID", "all-MiniLM-L6-v2"),
+    max_memory=int(os.getenv("EMBED_CACHE_MEMORY", "1024")),
+    max_rows=int(os.getenv("EMBED_CACHE_MAX_ROWS", "20000")),
+)
+embed = CachedEmbedder(_embed_with_model, EMBED_CACHE)
+
+# 쓰기 지연 큐: 이 개수가 모이거나 이 시간(초)이 지나면 한 번에 임베딩/저장
+INGEST_BATCH_SIZE = int(os.getenv("CHROMA_INGEST_BATCH_SIZE", "64"))
+INGEST_FLUSH_INTERVAL = float(os.getenv("CHROMA_INGEST_FLUSH_INTERVAL", "0.25"))
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def _build_docs(champion: str, data: Dict[str, str | dict], source: str, patch: str | None, fetched_at: float):
     docs = []
     metadatas = []
     ids = []
 
     champion_lower = champion.lower()
 
-    for section, text in data.items():
+    for section, value in data.items():
+        # chunk.py 형식이면 {"text": 본문, ...추가 메타데이터}
+        extra = {}
+        if isinstance(value, dict):
+            extra = {k: v for k, v in value.items() if k != "text"}
+            text = value.get("text")
+        else:
+            text = value
         if not text or len(text.strip()) < 10:
             continue
 
@@ -44,28 +172,404 @@ def store_champion_data(champion: str, data: Dict[str, str], source: str):
 
         docs.append(text)
         metadatas.append({
+            **extra,
             "champion": champion_lower,
             "section": section,
-            "source": source
+            "source": source,
+            "fetched_at": fetched_at,
+            "patch": patch or "",
+            "content_hash": content_hash(text),
         })
         ids.append(doc_id)
+    return docs, metadatas, ids
+
+
+def _write(docs: List[str], metadatas: List[dict], ids: List[str]) -> Tuple[int, int]:
+    """
+    내용(content_hash)이 바뀐 문서만 upsert 로 다시 임베딩하고,
+    그대로인 문서는 메타데이터(fetched_at, patch)만 갱신
+    :return: (임베딩한 문서 수, 건너뛴 문서 수)
+    """
+    collection = get_collection()
+    existing = collection.get(ids=ids, include=["metadatas"])
+    hashes = {
+        doc_id: (meta or {}).get("content_hash")
+        for doc_id, meta in zip(existing.get("ids") or [], existing.get("metadatas") or [])
+    }
+    changed = [k for k, doc_id in enumerate(ids) if hashes.get(doc_id) != metadatas[k]["content_hash"]]
+    unchanged = [k for k, doc_id in enumerate(ids) if hashes.get(doc_id) == metadatas[k]["content_hash"]]
+
+    if changed:
+        texts = [docs[k] for k in changed]
+        embeddings = embed(texts)
+        with timed("chroma", "upsert"):
+            collection.upsert(
+                documents=texts,
+                embeddings=embeddings,
+                metadatas=[metadatas[k] for k in changed],
+                ids=[ids[k] for k in changed],
+            )
+        _index_lexical([ids[k] for k in changed], texts, [metadatas[k] for k in changed])
+    if unchanged:
+        with timed("chroma", "update"):
+            collection.update(ids=[ids[k] for k in unchanged], metadatas=[metadatas[k] for k in unchanged])
+    return len(changed), len(unchanged)
+
+
+def store_champion_data(champion: str, data: Dict[str, str | dict], source: str, patch: str | None = None):
+    """
+    data: dict[section] -> text (또는 chunk.py 의 {"text", ...메타데이터})
+    patch: 수집 시점의 게임 패치 버전 (fetched_at 과 함께 메타데이터로 저장)
+    """
+    docs, metadatas, ids = _build_docs(champion, data, source, patch, time.time())
+
+    if docs:
+        # 같은 id 는 새 내용/메타데이터로 교체
+        embedded, skipped = _write(docs, metadatas, ids)
+        logger.info(f"[Chroma] upserted {embedded} docs ({skipped} unchanged) for {champion}")
+
+
+def store_champion_batch(items: List[Tuple[str, Dict[str, str | dict]]], source: str, patch: str | None = None):
+    """
+    여러 챔피언 문서를 한 번의 upsert (= 한 번의 배치 임베딩) 로 저장
+    items: [(champion, dict[section] -> text 또는 chunk)]
+    """
+    fetched_at = time.time()
+    docs, metadatas, ids = [], [], []
+    for champion, data in items:
+        d, m, i = _build_docs(champion, data, source, patch, fetched_at)
+        docs += d
+        metadatas += m
+        ids += i
 
     if docs:
-        collection.add(documents=docs, metadatas=metadatas, ids=ids)
-        logger.info(f"[Chroma] upserted {len(docs)} docs for {champion}")
+        embedded, skipped = _write(docs, metadatas, ids)
+        logger.info(f"[Chroma] upserted {embedded} docs ({skipped} unchanged) for {len(items)} champions")
 
 
-def search_champion(champion: str, question: str, n_results: int = 3):
+class IngestQueue:
     """
-    Returns Chroma result dict
+    요청 경로의 문서 저장을 모아서 처리하는 쓰기 지연 큐
+    - 같은 id 가 flush 전에 여러 번 들어오면 마지막 내용만 저장
+    - batch_size 개가 모이거나 interval 초가 지나면 한 번의 upsert (= 한 번의 배치 임베딩)
+    - 저장을 기다리는 요청이 있으면 interval 을 기다리지 않고 바로 flush
+      (flush 중에 들어온 문서는 다음 flush 에 함께 저장)
+    - 내용이 그대로인 문서는 다시 임베딩하지 않음
+    - 저장 실패는 그 문서를 기다리는 요청에만 전달
+    """
+
+    def __init__(self, batch_size: int = 64, interval: float = 0.25):
+        self.batch_size = batch_size
+        self.interval = interval
+        # doc id -> (document, metadata)
+        self._pending: Dict[str, Tuple[str, dict]] = {}
+        # (저장을 기다리는 future, 그 요청의 doc id 목록)
+        self._waiters: List[Tuple[asyncio.Future, List[str]]] = []
+        self._ready: asyncio.Event | None = None
+        self._now: asyncio.Event | None = None
+        self._flush_lock: asyncio.Lock | None = None
+        self._task: asyncio.Task | None = None
+        self._stats = {"submitted": 0, "deduplicated": 0, "flushes": 0, "embedded": 0, "unchanged": 0, "errors": 0}
+
+    def start(self):
+        """
+        flush 태스크 시작 (lifespan 에서 호출, 그 밖에서는 첫 submit 때 시작)
+        """
+        if self._task is None or self._task.done():
+            self._ready = asyncio.Event()
+            self._now = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+            if self._pending:
+                self._ready.set()
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """
+        flush 태스크를 멈추고 남은 문서를 저장
+        (진행 중인 flush 는 끝날 때까지 기다린 뒤 멈춤: 꺼낸 batch 와 그 waiter 를 잃지 않도록)
+        """
+        if self._task is None:
+            return
+        async with self._flush_lock:
+            self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        await self.flush()
+        self._task = None
+
+    async def submit(self, champion: str, data: Dict[str, str | dict], source: str, patch: str | None = None, wait: bool = True):
+        """
+        store_champion_data 의 비동기 버전
+        :param wait: True 면 이 문서가 저장될 때까지 대기 (이 문서 저장이 실패하면 그 예외를 raise)
+        """
+        docs, metadatas, ids = _build_docs(champion, data, source, patch, time.time())
+        if not docs:
+            return
+        self.start()
+        for doc, meta, doc_id in zip(docs, metadatas, ids):
+            if doc_id in self._pending:
+                self._stats["deduplicated"] += 1
+            self._pending[doc_id] = (doc, meta)
+        self._stats["submitted"] += len(docs)
+        self._ready.set()
+        if len(self._pending) >= self.batch_size:
+            self._now.set()
+        if wait:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append((waiter, ids))
+            self._now.set()
+            queued = time.perf_counter()
+            try:
+                await waiter
+            finally:
+                record_queue_wait("chroma_ingest", time.perf_counter() - queued)
+
+    async def _run(self):
+        while True:
+            await self._ready.wait()
+            if not self._now.is_set():
+                try:
+                    await asyncio.wait_for(self._now.wait(), self.interval)
+                except asyncio.TimeoutError:
+                    pass
+            await self.flush()
+
+    async def _write_chunk(self, chunk: List[Tuple[str, Tuple[str, dict]]]) -> Exception | None:
+        ids = [doc_id for doc_id, _ in chunk]
+        docs = [doc for _, (doc, _) in chunk]
+        metadatas = [meta for _, (_, meta) in chunk]
+        try:
+            embedded, skipped = await asyncio.to_thread(_write, docs, metadatas, ids)
+        except Exception as e:
+            self._stats["errors"] += 1
+            return e
+        self._stats["embedded"] += embedded
+        self._stats["unchanged"] += skipped
+        return None
+
+    async def flush(self):
+        if self._flush_lock is None:
+            return
+        async with self._flush_lock:
+            pending, self._pending = self._pending, {}
+            waiters, self._waiters = self._waiters, []
+            self._ready.clear()
+            self._now.clear()
+            if not pending:
+                for waiter, _ in waiters:
+                    if not waiter.done():
+                        waiter.set_result(None)
+                return
+            items = list(pending.items())
+            # doc id -> 저장 실패 예외
+            failed: Dict[str, Exception] = {}
+            for i in range(0, len(items), self.batch_size):
+                chunk = items[i:i + self.batch_size]
+                error = await self._write_chunk(chunk)
+                if error is None:
+                    continue
+                logger.warning(f"[Chroma] ingest flush failed for {len(chunk)} docs: {error}")
+                if len(chunk) == 1:
+                    failed[chunk[0][0]] = error
+                    continue
+                # 실패한 문서만 골라내도록 한 건씩 다시 저장
+                for item in chunk:
+                    error = await self._write_chunk([item])
+                    if error is not None:
+                        failed[item[0]] = error
+            self._stats["flushes"] += 1
+            logger.info(f"[Chroma] flushed {len(items)} docs")
+
+            for waiter, ids in waiters:
+                if waiter.done():
+                    continue
+                error = next((failed[doc_id] for doc_id in ids if doc_id in failed), None)
+                if error is None:
+                    waiter.set_result(None)
+                else:
+                    waiter.set_exception(error)
+
+    def stats(self) -> dict:
+        return {**self._stats, "pending": len(self._pending)}
+
+
+INGEST_QUEUE = IngestQueue(INGEST_BATCH_SIZE, INGEST_FLUSH_INTERVAL)
+
+
+def get_patched_champions(source: str, patch: str) -> set:
+    """
+    source 문서가 이미 patch 버전으로 저장된 챔피언 (소문자)
+    """
+    res = get_collection().get(where={"$and": [{"source": source}, {"patch": patch}]}, include=["metadatas"])
+    return {meta.get("champion") for meta in res.get("metadatas") or []}
+
+
+def get_source_state(champion: str) -> Dict[tuple, dict]:
+    """
+    (source, section) -> {"fetched_at", "patch", "query"} (임베딩 없이 메타데이터만 조회)
+    """
+    collection = get_collection()
+    with timed("chroma", "get"):
+        res = collection.get(where={"champion": champion.lower()}, include=["metadatas"])
+    state = {}
+    for meta in res.get("metadatas") or []:
+        state[(meta.get("source"), meta.get("section"))] = {
+            "fetched_at": meta.get("fetched_at") or 0.0,
+            "patch": meta.get("patch") or "",
+            "query": meta.get("query") or "",
+        }
+    return state
+
+
+def prune_sections(champion: str, source: str, keep: set, prefix: str = "") -> int:
+    """
+    source 문서 중 prefix 로 시작하고 keep 에 없는 section 삭제
+    (재수집 결과 chunk 수가 줄었거나, chunk 도입 전의 통짜 "data" 문서)
+    """
+    collection = get_collection()
+    res = collection.get(
+        where={"$and": [{"champion": champion.lower()}, {"source": source}]}, include=["metadatas"]
+    )
+    stale = [
+        doc_id
+        for doc_id, meta in zip(res.get("ids") or [], res.get("metadatas") or [])
+        if (meta.get("section") or "").startswith(prefix) and meta.get("section") not in keep
+    ]
+    if stale:
+        collection.delete(ids=stale)
+        _index_lexical(stale)
+    return len(stale)
+
+
+def prune_search(champion: str, query: str, keep: set, max_chunks: int, max_age: float) -> int:
+    """
+    검색 chunk 정리
+    - 같은 질문으로 다시 받은 결과에 없고 다른 질문과 공유하지 않는 chunk (query 메타데이터 / 예전 "q:...#i" section)
+    - max_age 초보다 오래된 chunk
+    - 챔피언별 max_chunks 개를 넘으면 오래된 것부터
+    """
+    collection = get_collection()
+    res = collection.get(
+        where={"$and": [{"champion": champion.lower()}, {"source": "search"}]}, include=["metadatas"]
+    )
+    now = time.time()
+    stale = []
+    alive = []
+    for doc_id, meta in zip(res.get("ids") or [], res.get("metadatas") or []):
+        section = meta.get("section") or ""
+        # query 메타데이터는 이 결과를 가져온 질문 목록 (공백 구분)
+        only_query = (meta.get("query") or "").split() == [query] or section.startswith(query + "#")
+        if section in keep:
+            alive.append((meta.get("fetched_at") or 0.0, doc_id))
+        elif only_query or now - (meta.get("fetched_at") or 0.0) > max_age:
+            stale.append(doc_id)
+        else:
+            alive.append((meta.get("fetched_at") or 0.0, doc_id))
+    if len(alive) > max_chunks:
+        alive.sort(reverse=True)
+        stale += [doc_id for _, doc_id in alive[max_chunks:]]
+    if stale:
+        collection.delete(ids=stale)
+        _index_lexical(stale)
+    return len(stale)
+
+
+def _dedupe(ranked: List[tuple[str, float]], lookup, n: int) -> List[tuple[str, float]]:
+    """
+    같은 본문(content_hash)이 다른 id 로 저장돼 있으면 순위가 높은 하나만 남기고 상위 n 개
+    """
+    seen = set()
+    result = []
+    for doc_id, score in ranked:
+        entry = lookup(doc_id)
+        key = (entry[1] or {}).get("content_hash") if entry else None
+        if key is not None:
+            if key in seen:
+                continue
+            seen.add(key)
+        result.append((doc_id, score))
+        if len(result) == n:
+            break
+    return result
+
+
+def _lexical_result(index: BM25Index, ranked: List[tuple[str, float]], mode: str, fallback: dict | None = None) -> dict:
+    entries = [index.get(doc_id) or (fallback or {})[doc_id] for doc_id, _ in ranked]
+    return {
+        "ids": [[doc_id for doc_id, _ in ranked]],
+        "documents": [[text for text, _ in entries]],
+        "metadatas": [[meta for _, meta in entries]],
+        "scores": [[round(score, 6) for _, score in ranked]],
+        "mode": mode,
+    }
+
+
+def search_champion(champion: str, question: str, n_results: int = 3, token_budget: int | None = None,
+                    mode: str = "hybrid"):
+    """
+    Returns Chroma result dict 형식 (관련도 순 상위 n_results 개 chunk)
+    mode:
+    - "vector": Chroma 벡터 검색만
+    - "lexical": BM25 만 (임베딩 없음)
+    - "hybrid": BM25 + 벡터 순위를 RRF 로 합침
+      BM25 1위 문서가 질문 토큰을 모두 포함하고 BM25 결과가 n_results 개 이상이면 임베딩 없이 BM25 결과만 반환
+    token_budget: 주어지면 상위 chunk 부터 이 토큰 수(추정) 안에 들어가는 만큼만 반환
     """
     champion_lower = champion.lower()
     query = f"{champion_lower} {question}"
 
-    res = collection.query(
-        query_texts=[query],
-        n_results=n_results,
-        where={"champion": champion_lower}
-    )
+    res = None
+    lexical = []
+    if mode != "vector":
+        index = get_lexical_index()
+        # champion 필터는 따로 걸리므로 질문만으로 검색
+        with timed("bm25", "query"):
+            lexical = index.search(question, max(n_results * HYBRID_CANDIDATES, 10), champion_lower)
+        top = _dedupe([(hit.doc_id, hit.score) for hit in lexical], index.get, n_results)
+        if mode == "lexical" or (len(top) >= n_results and lexical[0].coverage == 1.0):
+            _search_stats["lexical" if mode == "lexical" else "lexical_fast_path"] += 1
+            res = _lexical_result(index, top, "lexical")
+
+    if res is None:
+        query_embeddings = embed([query])
+        with timed("chroma", "query"):
+            # 중복 본문을 걸러도 n_results 개가 남도록 여유 있게 가져옴
+            vector = get_collection().query(
+                query_embeddings=query_embeddings,
+                n_results=max(n_results * HYBRID_CANDIDATES, 10) if lexical else n_results * 2,
+                where={"champion": champion_lower}
+            )
+        # 본문/메타데이터는 역색인에서, 역색인에 아직 반영 안 된 문서는 벡터 결과에서 읽음
+        fallback = {
+            doc_id: (doc, meta)
+            for doc_id, doc, meta in zip(vector["ids"][0], vector["documents"][0], vector["metadatas"][0])
+        }
+        if lexical:
+            _search_stats["hybrid"] += 1
+            fused = _dedupe(rrf_fuse([[hit.doc_id for hit in lexical], vector["ids"][0]]),
+                            lambda doc_id: index.get(doc_id) or fallback.get(doc_id), n_results)
+            res = _lexical_result(index, fused, "hybrid", fallback)
+        else:
+            _search_stats["vector"] += 1
+            ranked = list(zip(vector["ids"][0], vector["distances"][0]))
+            keep = {doc_id for doc_id, _ in _dedupe(ranked, fallback.get, n_results)}
+            positions = [k for k, doc_id in enumerate(vector["ids"][0]) if doc_id in keep]
+            res = {
+                field: [[vector[field][0][k] for k in positions]]
+                for field in ("ids", "documents", "metadatas", "distances")
+                if vector.get(field)
+            }
+            res["mode"] = "vector"
 
+    if token_budget is not None and res.get("documents"):
+        keep = within_budget(res["documents"][0], token_budget)
+        for field in ("ids", "documents", "metadatas", "distances", "scores"):
+            if res.get(field):
+                res[field] = [res[field][0][:keep]]
     return res
+
+
+def search_stats() -> dict:
+    return {**_search_stats, "lexical_docs": len(_lexical) if _lexical is not None else 0}
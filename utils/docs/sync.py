@@ -0,0 +1,274 @@
+# utils/docs/sync.py
+import os
+import asyncio
+import hashlib
+import logging
+import time
+from collections import Counter
+from typing import List
+
+from utils.docs.store import INGEST_QUEUE, get_source_state, prune_sections, prune_search
+from utils.docs.chunk import chunk_ddragon, chunk_fow, chunk_search
+from utils.docs.ddragon import fetch_champion_ddragon, get_latest_version
+from utils.docs.fow import crawl_fow
+from utils.docs.search import scrape_search
+from utils.riot.base import SHARED_STATE
+
+logger = logging.getLogger(__name__)
+
+# 소스별 응답 대기 상한 (초): 넘기면 해당 소스는 버리고 나머지로 응답
+SOURCE_DEADLINES = {
+    "ddragon": float(os.getenv("RAG_DDRAGON_DEADLINE", "4")),
+    "FOW": float(os.getenv("RAG_FOW_DEADLINE", "6")),
+    "search": float(os.getenv("RAG_SEARCH_DEADLINE", "5")),
+}
+
+# 소스별 재수집 주기 (초), None 이면 패치가 바뀔 때만 재수집
+SOURCE_TTLS = {
+    "ddragon": None,
+    "FOW": float(os.getenv("RAG_FOW_TTL", str(12 * 3600))),
+    "search": float(os.getenv("RAG_SEARCH_TTL", str(6 * 3600))),
+}
+
+# 챔피언별 검색 chunk 상한 / 보관 기간 (초): 질문마다 새 결과가 쌓이지 않도록 정리
+SEARCH_MAX_CHUNKS = int(os.getenv("RAG_SEARCH_MAX_CHUNKS", "30"))
+SEARCH_MAX_AGE = float(os.getenv("RAG_SEARCH_MAX_AGE", str(7 * 24 * 3600)))
+
+# champion -> 진행 중인 백그라운드 갱신
+_refreshing: dict[str, asyncio.Task] = {}
+# (champion, source, group) -> 진행 중인 없는 소스 수집 (같은 질문이 동시에 와도 한 번만 수집)
+_collecting: dict[tuple, asyncio.Task] = {}
+# 저장된 적 없는 소스를 요청 안에서 기다리는 상한 (초): 넘기면 수집은 백그라운드로 계속하고 refreshing 으로 응답
+INLINE_WAIT = float(os.getenv("RAG_INLINE_WAIT", "1.5"))
+# worker 가 여럿일 때 한 챔피언의 백그라운드 갱신을 맡는 시간 상한 (초)
+REFRESH_LEASE_TTL = float(os.getenv("RAG_REFRESH_LEASE_TTL", "60"))
+
+
+# ------------------------
+# skill_order 빈도 기반 정리
+# ------------------------
+def reorder_skill_order(skills: List[str]) -> List[str]:
+    filtered = [s for s in skills if s != 'R']
+    count = Counter(filtered)
+    sorted_skills = [skill for skill, _ in count.most_common()]
+    # 누락된 스킬(Q/W/E) 추가
+    for s in ['Q','W','E']:
+        if s not in sorted_skills:
+            sorted_skills.append(s)
+    return sorted_skills
+
+
+def search_section(question: str) -> str:
+    # 검색 결과는 질문마다 다르므로 질문별로 재수집 주기를 관리 (chunk 메타데이터 query)
+    normalized = " ".join(question.lower().split())
+    return "q:" + hashlib.sha1(normalized.encode()).hexdigest()[:12]
+
+
+async def _fetch_source(name: str, coro):
+    try:
+        return await asyncio.wait_for(coro, SOURCE_DEADLINES[name])
+    except asyncio.TimeoutError:
+        logger.warning(f"{name} fetch timed out after {SOURCE_DEADLINES[name]}s")
+    except Exception as e:
+        logger.warning(f"{name} fetch error: {e}")
+    return None
+
+
+async def _fetch_fow(champion: str):
+    fow = await crawl_fow(champion.lower())
+    if fow.get("skill_order"):
+        fow["skill_order"] = reorder_skill_order(fow["skill_order"])
+    logger.debug(f"fow crawl result for {champion}: {fow}")
+    return fow
+
+
+# 검색 chunk 하나에 기록해 두는 질문 수 (같은 결과가 여러 질문에서 나올 때)
+SEARCH_QUERIES_PER_CHUNK = 8
+
+
+def _groups(source: str, section: str, meta: dict) -> list[str]:
+    # 검색은 그 결과를 가져온 질문별로 (예전 "q:...#i" section 은 section 앞부분)
+    # 나머지 소스는 chunk 전체를 하나로 갱신
+    if source != "search":
+        return ["data"]
+    return (meta.get("query") or "").split() or [section.partition("#")[0]]
+
+
+def _merge_queries(chunks: dict, query: str, state: dict) -> dict:
+    """
+    이미 저장된 검색 chunk 면 예전 질문 목록 뒤에 이번 질문을 붙임 (최근 SEARCH_QUERIES_PER_CHUNK 개)
+    """
+    merged = {}
+    for section, chunk in chunks.items():
+        previous = (state.get(("search", section)) or {}).get("query", "").split()
+        queries = [q for q in previous if q != query] + [query]
+        merged[section] = {**chunk, "query": " ".join(queries[-SEARCH_QUERIES_PER_CHUNK:])}
+    return merged
+
+
+def _group_state(state: dict) -> dict:
+    """
+    (source, section) 별 chunk 상태 → (source, group) 별 상태
+    가장 오래된 chunk 기준, 패치가 섞여 있으면 "" (= 다시 수집)
+    """
+    grouped = {}
+    for (source, section), meta in state.items():
+        for group in _groups(source, section, meta):
+            key = (source, group)
+            prev = grouped.get(key)
+            if prev is None:
+                grouped[key] = dict(meta)
+                continue
+            prev["fetched_at"] = min(prev["fetched_at"], meta["fetched_at"])
+            if prev["patch"] != meta["patch"]:
+                prev["patch"] = ""
+    return grouped
+
+
+def _chunks(champion: str, source: str, section: str, data) -> dict:
+    if source == "ddragon":
+        return chunk_ddragon(champion, data)
+    if source == "FOW":
+        return chunk_fow(champion, data)
+    return chunk_search(champion, section, data)
+
+
+async def _store_chunks(champion: str, source: str, section: str, chunks: dict, patch: str, state: dict) -> bool:
+    """
+    저장 실패(Chroma / 임베딩)는 로그만 남기고 False (요청은 이미 저장된 문서로 응답)
+    """
+    if source == "search":
+        chunks = _merge_queries(chunks, section, state)
+    try:
+        await INGEST_QUEUE.submit(champion, chunks, source, patch)
+        # 이번에 만들지 않은 예전 chunk 정리
+        if source == "search":
+            await asyncio.to_thread(prune_search, champion, section, set(chunks), SEARCH_MAX_CHUNKS, SEARCH_MAX_AGE)
+        else:
+            await asyncio.to_thread(prune_sections, champion, source, set(chunks))
+    except Exception as e:
+        logger.warning(f"storing {source} chunks failed for {champion}: {e}")
+        return False
+    return True
+
+
+def _stale_sources(state: dict, wanted: list[tuple], patch: str, force: bool) -> list[tuple]:
+    now = time.time()
+    stale = []
+    for key in wanted:
+        stored = state.get(key)
+        ttl = SOURCE_TTLS[key[0]]
+        if (
+            force
+            or stored is None
+            or stored["patch"] != patch
+            or (ttl is not None and now - stored["fetched_at"] > ttl)
+        ):
+            stale.append(key)
+    return stale
+
+
+async def find_stale_sources(champion: str, question: str, force: bool = False) -> tuple[str, dict, list[tuple]]:
+    """
+    (최신 패치, 저장된 chunk 상태, 이 질문에 필요한 소스 중 다시 받아야 하는 (source, group) 목록)
+    """
+    patch, state = await asyncio.gather(get_latest_version(), asyncio.to_thread(get_source_state, champion))
+    wanted = [("ddragon", "data"), ("FOW", "data"), ("search", search_section(question))]
+    return patch, state, _stale_sources(_group_state(state), wanted, patch, force)
+
+
+async def _refresh_sources(champion: str, question: str, n_results: int, patch: str, state: dict,
+                           stale: list[tuple]) -> list[str]:
+    fetchers = {
+        "ddragon": lambda: fetch_champion_ddragon(champion, version=patch),
+        "FOW": lambda: _fetch_fow(champion),
+        "search": lambda: scrape_search(champion, question, n_results=n_results),
+    }
+    results = await asyncio.gather(*[_fetch_source(source, fetchers[source]()) for source, _ in stale])
+
+    # 소스별로 chunk 로 나눠 쓰기 지연 큐로 넘김 (다른 요청의 문서와 함께 한 번에 임베딩)
+    writes = []
+    stored = []
+    for (source, section), data in zip(stale, results):
+        chunks = _chunks(champion, source, section, data) if data else {}
+        if not chunks:
+            continue
+        writes.append(_store_chunks(champion, source, section, chunks, patch, state))
+        stored.append(source)
+    saved = await asyncio.gather(*writes)
+    return [source for source, ok in zip(stored, saved) if ok]
+
+
+async def refresh_champion(champion: str, question: str, n_results: int = 3, force: bool = False) -> list[str]:
+    """
+    오래됐거나(TTL), 패치가 바뀌었거나, 없거나, force 인 소스만 다시 받아 저장
+    :return: 새로 저장한 소스 이름 목록
+    """
+    patch, state, stale = await find_stale_sources(champion, question, force)
+    if not stale:
+        return []
+    return await _refresh_sources(champion, question, n_results, patch, state, stale)
+
+
+async def _refresh_logged(champion: str, question: str, n_results: int, patch: str, state: dict,
+                          stale: list[tuple]):
+    try:
+        await _refresh_sources(champion, question, n_results, patch, state, stale)
+    except Exception as e:
+        logger.warning(f"refresh {stale} failed for {champion}: {e}")
+
+
+async def _collect_missing(champion: str, question: str, n_results: int, patch: str, state: dict,
+                           missing: list[tuple]) -> bool:
+    """
+    저장된 적 없는 소스를 수집하고 INLINE_WAIT 초까지만 기다림
+    :return: 이번 요청 안에 모두 저장됐으면 True
+    """
+    tasks = set()
+    for source in missing:
+        key = (champion.lower(), *source)
+        if key not in _collecting:
+            # 소스마다 따로 저장 (느린 검색 때문에 DDragon / FOW 저장이 늦어지지 않도록)
+            _collecting[key] = asyncio.create_task(
+                _refresh_logged(champion, question, n_results, patch, state, [source])
+            )
+            _collecting[key].add_done_callback(lambda _, key=key: _collecting.pop(key, None))
+        tasks.add(_collecting[key])
+    _, waiting = await asyncio.wait(tasks, timeout=INLINE_WAIT)
+    return not waiting
+
+
+async def sync_champion(champion: str, question: str, n_results: int = 3, force: bool = False) -> bool:
+    """
+    이 질문에 필요한 소스를 맞춤
+    - 저장된 적이 없는 소스 (처음 보는 챔피언의 FOW, 이 질문의 검색 결과 등)는 바로 수집을 시작해서
+      INLINE_WAIT 초까지만 기다림 (그 뒤로는 백그라운드에서 계속)
+    - 오래됐거나 패치가 바뀌었거나 force 인 소스는 백그라운드에서 갱신
+      (챔피언별로 하나만 실행, worker 가 여럿이면 lease 를 잡은 worker 만)
+    :return: 수집 / 갱신이 아직 진행 중이면 True
+    """
+    patch, state, stale = await find_stale_sources(champion, question, force)
+    grouped = _group_state(state)
+    missing = [key for key in stale if key not in grouped]
+    collecting = bool(missing) and not await _collect_missing(champion, question, n_results, patch, state, missing)
+
+    outdated = [key for key in stale if key in grouped]
+    if not outdated or champion in _refreshing:
+        return collecting or champion in _refreshing
+
+    async def run():
+        # lease 는 태스크 안에서 잡고 놓음 (_refreshing 확인과 등록 사이에 await 가 없도록)
+        lease = f"rag_refresh:{champion.lower()}"
+        if SHARED_STATE is not None and not await SHARED_STATE.acquire_lease(lease, REFRESH_LEASE_TTL):
+            # 다른 worker 가 갱신 중
+            return
+        try:
+            await _refresh_logged(champion, question, n_results, patch, state, outdated)
+        finally:
+            if SHARED_STATE is not None:
+                await SHARED_STATE.release_lease(lease)
+
+    task = asyncio.create_task(run())
+    _refreshing[champion] = task
+    task.add_done_callback(lambda _: _refreshing.pop(champion, None))
+    return True
@@ -0,0 +1,113 @@
+# utils/lru_store.py
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class LRUTable:
+    """
+    메모리 LRU (max_memory 개) → SQLite 테이블 (max_rows 행) 2단 저장 공통 부분
+    - 테이블은 (key 컬럼, value BLOB 컬럼, accessed_at REAL) 을 가져야 함 (그 밖의 컬럼은 호출 측 스키마)
+    - 디스크가 가득 차면 가장 오래 조회되지 않은 행부터, 한 번에 10% 여유를 두고 삭제
+    - SQLite 연결 / lock / 값 직렬화는 호출 측 것을 사용 (SQLite 메서드는 lock 을 잡은 상태에서 호출)
+    """
+
+    def __init__(self, table: str, key_column: str, value_column: str, max_memory: int, max_rows: int):
+        self.table = table
+        self.key_column = key_column
+        self.value_column = value_column
+        self.max_memory = max_memory
+        self.max_rows = max_rows
+        self.memory: OrderedDict[Hashable, Any] = OrderedDict()
+        self.rows = 0
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+    # ------------------------
+    # 메모리 LRU
+    # ------------------------
+    def remember(self, key: Hashable, value: Any):
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_memory:
+            self.memory.popitem(last=False)
+
+    def lookup(self, keys: list) -> tuple[dict, list]:
+        """
+        (메모리에 있는 key -> 값, 없는 key 목록)
+        """
+        found = {}
+        missing = []
+        for key in keys:
+            value = self.memory.get(key)
+            if value is None:
+                missing.append(key)
+            else:
+                self.memory.move_to_end(key)
+                found[key] = value
+        self._stats["memory_hits"] += len(found)
+        return found, missing
+
+    # ------------------------
+    # SQLite
+    # ------------------------
+    def attach(self, db: sqlite3.Connection):
+        """
+        테이블을 만든 뒤 한 번 호출 (accessed_at 인덱스, 현재 행 수)
+        """
+        db.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_accessed ON {self.table}(accessed_at)")
+        self.rows = db.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def load(self, db: sqlite3.Connection, keys: list) -> list[tuple[Any, bytes]]:
+        """
+        디스크에서 (key, blob) 을 읽고 조회 시각 갱신
+        """
+        placeholders = ",".join("?" * len(keys))
+        rows = db.execute(
+            f"SELECT {self.key_column}, {self.value_column} FROM {self.table} WHERE {self.key_column} IN ({placeholders})",
+            keys,
+        ).fetchall()
+        if rows:
+            db.execute(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE {self.key_column} IN ({','.join('?' * len(rows))})",
+                [time.time(), *(r[0] for r in rows)],
+            )
+            db.commit()
+        self._stats["disk_hits"] += len(rows)
+        self._stats["misses"] += len(set(keys)) - len(rows)
+        return rows
+
+    def save(self, db: sqlite3.Connection, items: list[tuple[Any, bytes]], **columns):
+        """
+        (key, blob) 저장 (이미 있는 key 는 그대로), columns 는 모든 행에 같은 값을 넣을 나머지 컬럼
+        """
+        now = time.time()
+        names = [self.key_column, self.value_column, "accessed_at", *columns]
+        values = list(columns.values())
+        before = db.total_changes
+        db.executemany(
+            f"INSERT OR IGNORE INTO {self.table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+            [(key, blob, now, *values) for key, blob in items],
+        )
+        self.rows += db.total_changes - before
+        if self.rows > self.max_rows:
+            # 한 번에 10% 여유를 두고 정리해서 매 쓰기마다 삭제하지 않도록 함
+            excess = self.rows - int(self.max_rows * 0.9)
+            cur = db.execute(
+                f"DELETE FROM {self.table} WHERE {self.key_column} IN "
+                f"(SELECT {self.key_column} FROM {self.table} ORDER BY accessed_at LIMIT ?)",
+                (excess,),
+            )
+            self.rows -= cur.rowcount
+            self._stats["evictions"] += cur.rowcount
+        db.commit()
+
+    def stats(self) -> dict:
+        lookups = self._stats["memory_hits"] + self._stats["disk_hits"] + self._stats["misses"]
+        hits = lookups - self._stats["misses"]
+        return {
+            **self._stats,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self.memory),
+            "disk_entries": self.rows,
+        }
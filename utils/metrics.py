@@ -0,0 +1,197 @@
+# utils/metrics.py
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# 요청 처리 중 기록된 (이름, 초) 목록 (Server-Timing 헤더용, 미들웨어 밖이면 None)
+_request_timings: ContextVar[list | None] = ContextVar("request_timings", default=None)
+
+# 초 단위 버킷 (5ms ~ 30s)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Histogram:
+    """
+    Prometheus 형식 누적 히스토그램 (라벨 조합별 버킷 카운트/합계/개수)
+    """
+
+    def __init__(self, name: str, help: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 값 tuple -> [버킷별 개수(+Inf 포함), 합계]
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+        for labels, counts, total in sorted(series):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = _labels(self.labelnames, labels, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            cumulative += counts[-1]
+            le = _labels(self.labelnames, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {total}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+REQUEST_SECONDS = Histogram(
+    "expr_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status")
+)
+UPSTREAM_SECONDS = Histogram(
+    "expr_upstream_duration_seconds", "Upstream call latency (Riot, DDragon, FOW, search, Chroma, embedding)",
+    ("upstream", "operation"),
+)
+QUEUE_WAIT_SECONDS = Histogram(
+    "expr_queue_wait_seconds", "Time spent waiting in internal queues (rate limiter, ingest)", ("queue",)
+)
+HISTOGRAMS = (REQUEST_SECONDS, UPSTREAM_SECONDS, QUEUE_WAIT_SECONDS)
+
+
+def _add_timing(name: str, seconds: float):
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.append((name, seconds))
+
+
+def record_upstream(upstream: str, operation: str, seconds: float):
+    UPSTREAM_SECONDS.observe(seconds, upstream, operation)
+    _add_timing(upstream, seconds)
+
+
+def record_queue_wait(queue: str, seconds: float):
+    QUEUE_WAIT_SECONDS.observe(seconds, queue)
+    _add_timing(f"{queue}-wait", seconds)
+
+
+@contextmanager
+def timed(upstream: str, operation: str = ""):
+    """
+    with timed("ddragon", "champion"): ...  (동기/비동기 코드, to_thread 안에서도 사용 가능)
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_upstream(upstream, operation, time.perf_counter() - started)
+
+
+def render_gauges(name: str, help: str, label: str, values: dict) -> list[str]:
+    """
+    {"account": 0.93, ...} -> name{label="account"} 0.93
+    """
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} gauge"]
+    for key, value in sorted(values.items()):
+        lines.append(f"{name}{{{label}=\"{_escape(key)}\"}} {float(value)}")
+    return lines
+
+
+def render_histograms() -> list[str]:
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines += histogram.render()
+    return lines
+
+
+_TOKEN_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def server_timing(timings: list, total: float) -> str:
+    """
+    같은 이름은 합쳐서 "riot;dur=12.3;desc=\"3 calls\", ..., app;dur=45.6"
+    """
+    merged: dict[str, list] = {}
+    for name, seconds in timings:
+        entry = merged.setdefault(_TOKEN_UNSAFE.sub("_", name), [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+    parts = []
+    for name, (seconds, count) in merged.items():
+        desc = f';desc="{count} calls"' if count > 1 else ""
+        parts.append(f"{name};dur={seconds * 1000:.1f}{desc}")
+    parts.append(f"app;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+def _route_template(scope) -> str:
+    """
+    "/match/detail/all/{game_name}/{tag_line}" 처럼 라우터 prefix 를 포함한 route 템플릿
+    (FastAPI 버전에 따라 route.path 에 include_router prefix 가 없으므로 실제 경로에서 prefix 를 복원)
+    """
+    route = scope.get("route")
+    path_format = getattr(route, "path_format", None)
+    if path_format is None:
+        return "unmatched"
+    try:
+        suffix = path_format.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return path_format
+    path = scope.get("path", "")
+    if suffix and not path.endswith(suffix):
+        return path_format
+    return path[:len(path) - len(suffix)] + path_format
+
+
+class ServerTimingMiddleware:
+    """
+    요청별 route 지연시간 히스토그램 + 업스트림 시간을 Server-Timing 헤더로 추가
+    (ASGI 미들웨어: 스트리밍 응답은 헤더를 보내는 시점까지 기록된 시간만 포함)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = []
+        token = _request_timings.set(timings)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                header = server_timing(timings, time.perf_counter() - started)
+                message["headers"] = [*message.get("headers", []), (b"server-timing", header.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timings.reset(token)
+            # 경로 파라미터가 들어간 실제 URL 대신 route 템플릿으로 기록 (라벨 수 제한)
+            REQUEST_SECONDS.observe(time.perf_counter() - started, scope["method"], _route_template(scope), str(status))
@@ -1,10 +1,33 @@
+import os
+from dotenv import load_dotenv
 from models.account import AccountDTO
-from utils.riot.base import get_request
+from utils.riot.base import get_request, shared_cache
+from utils.riot.cache import TTLCache
 
-async def get_account_by_riot_id(game_name: str, tag_line: str):
+load_dotenv()
+
+# puuid 와 Riot ID 매핑은 거의 바뀌지 않으므로 길게 캐시
+ACCOUNT_CACHE = TTLCache(
+    ttl=float(os.getenv("ACCOUNT_CACHE_TTL", str(24 * 3600))),
+    stale_ttl=float(os.getenv("ACCOUNT_CACHE_STALE_TTL", str(7 * 24 * 3600))),
+    max_entries=int(os.getenv("ACCOUNT_CACHE_SIZE", "10000")),
+    shared=shared_cache("account", dumps=lambda a: a.model_dump_json().encode(), loads=AccountDTO.model_validate_json),
+)
+
+async def _fetch_account_by_riot_id(game_name: str, tag_line: str):
     endpoint = f"/riot/account/v1/accounts/by-riot-id/{game_name}/{tag_line}"
-    return AccountDTO(**await get_request(endpoint, "asia"))
+    account = AccountDTO(**await get_request(endpoint, "asia", method="account-v1.by-riot-id"))
+    ACCOUNT_CACHE.set(("puuid", account.puuid), account)
+    return account
 
-async def get_account_by_puuid(puuid: str):
+async def _fetch_account_by_puuid(puuid: str):
     endpoint = f"/riot/account/v1/accounts/by-puuid/{puuid}"
-    return AccountDTO(**await get_request(endpoint, "asia"))
\ No newline at end of file
+    return AccountDTO(**await get_request(endpoint, "asia", method="account-v1.by-puuid"))
+
+async def get_account_by_riot_id(game_name: str, tag_line: str):
+    # Riot ID 는 대소문자/앞뒤 공백을 구분하지 않음
+    key = ("riot-id", game_name.strip().lower(), tag_line.strip().lower())
+    return await ACCOUNT_CACHE.get_or_load(key, lambda: _fetch_account_by_riot_id(game_name, tag_line))
+
+async def get_account_by_puuid(puuid: str):
+    return await ACCOUNT_CACHE.get_or_load(("puuid", puuid), lambda: _fetch_account_by_puuid(puuid))
\ No newline at end of file
@@ -1,29 +1,200 @@
 import os
+import time
+import importlib.util
 import httpx
+import orjson
 from fastapi import HTTPException
 from dotenv import load_dotenv
+from utils.riot.ratelimit import RateLimiter
+from utils.riot.shared import SharedState, SharedCache
+from utils.riot.singleflight import SingleFlight
+from utils.metrics import record_queue_wait, timed
 
 load_dotenv()
 
 RIOT_API_KEY = os.getenv("RIOT_API_KEY")
-BASE_URL_TEMPLATE = "https://{region}.api.riotgames.com"
+# 로컬 스텁 서버로 돌릴 때는 RIOT_BASE_URL_TEMPLATE 로 덮어씀 (예: http://127.0.0.1:9000/{region})
+BASE_URL_TEMPLATE = os.getenv("RIOT_BASE_URL_TEMPLATE", "https://{region}.api.riotgames.com")
 
-HEADERS = {"X-Riot-Token": RIOT_API_KEY}
+HEADERS = {"X-Riot-Token": RIOT_API_KEY or ""}
 
-async def get_request(endpoint: str, region: str = "kr"):
+# lifespan 에서 미리 열어둘 region 목록
+DEFAULT_REGIONS = ("asia", "kr")
+
+# 커넥션 풀 설정 (환경변수로 조정 가능)
+# HTTP/2 는 h2 패키지가 있을 때만 사용
+HTTP2_ENABLED = os.getenv("RIOT_HTTP2", "1") != "0" and importlib.util.find_spec("h2") is not None
+POOL_LIMITS = httpx.Limits(
+    max_connections=int(os.getenv("RIOT_MAX_CONNECTIONS", "20")),
+    max_keepalive_connections=int(os.getenv("RIOT_MAX_KEEPALIVE", "10")),
+    keepalive_expiry=float(os.getenv("RIOT_KEEPALIVE_EXPIRY", "30")),
+)
+TIMEOUT = httpx.Timeout(
+    float(os.getenv("RIOT_TIMEOUT", "10")),
+    connect=float(os.getenv("RIOT_CONNECT_TIMEOUT", "5")),
+    pool=float(os.getenv("RIOT_POOL_TIMEOUT", "10")),
+)
+
+# 여러 uvicorn worker 가 rate limit 사용량과 account/league 캐시를 공유할 SQLite 파일
+# (비어 있으면 worker 마다 메모리에만 보관)
+SHARED_STATE_PATH = os.getenv("RIOT_SHARED_STATE_PATH", "")
+SHARED_STATE = SharedState(SHARED_STATE_PATH) if SHARED_STATE_PATH else None
+
+# Riot rate limit 스케줄러 (첫 응답 전까지는 개발 키 기본 한도 사용)
+RATE_LIMITER = RateLimiter(os.getenv("RIOT_APP_RATE_LIMIT", "20:1,100:120"), backend=SHARED_STATE)
+# 429 를 받았을 때 Retry-After 만큼 기다린 뒤 재시도하는 횟수
+MAX_RETRIES = int(os.getenv("RIOT_MAX_RETRIES", "3"))
+# 같은 region+endpoint 동시 호출 합치기
+SINGLE_FLIGHT = SingleFlight()
+
+# region -> 장기 유지 클라이언트
+_clients: dict[str, httpx.AsyncClient] = {}
+
+# region -> 풀 대기 시간 통계
+_pool_waits: dict[str, dict] = {}
+
+
+def _new_client(region: str) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=BASE_URL_TEMPLATE.format(region=region),
+        headers=HEADERS,
+        http2=HTTP2_ENABLED,
+        limits=POOL_LIMITS,
+        timeout=TIMEOUT,
+    )
+
+
+def get_client(region: str) -> httpx.AsyncClient:
+    """
+    region 별 공유 클라이언트 반환 (lifespan 밖에서 호출되면 지연 생성)
+    """
+    client = _clients.get(region)
+    if client is None or client.is_closed:
+        client = _clients[region] = _new_client(region)
+    return client
+
+
+async def init_clients(regions=DEFAULT_REGIONS):
+    for region in regions:
+        get_client(region)
+
+
+async def close_clients():
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+def shared_cache(namespace: str, **kwargs) -> SharedCache | None:
+    """
+    TTLCache(shared=...) 용 공유 계층 (RIOT_SHARED_STATE_PATH 가 없으면 None)
+    """
+    return SharedCache(SHARED_STATE, namespace, **kwargs) if SHARED_STATE is not None else None
+
+
+def _wait_stats(region: str) -> dict:
+    stats = _pool_waits.get(region)
+    if stats is None:
+        stats = _pool_waits[region] = {"requests": 0, "in_flight": 0, "wait_total": 0.0, "wait_max": 0.0}
+    return stats
+
+
+def _pool_connections(client: httpx.AsyncClient) -> tuple[int, int] | None:
+    """
+    (열린 커넥션 수, 유휴 커넥션 수), 조회할 수 없으면 None
+    httpx 는 풀 상태를 공개하지 않으므로 httpcore 풀(비공개 속성)을 조회:
+    httpx / httpcore 버전에 따라 구조가 바뀌어도 통계만 비고 예외는 내지 않음
+    """
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = getattr(pool, "connections", None)
+    if connections is None:
+        return None
+    try:
+        connections = list(connections)
+        return len(connections), sum(1 for c in connections if c.is_idle())
+    except Exception:
+        return None
+
+
+def get_pool_stats() -> dict:
+    """
+    region 별 커넥션 풀 상태
+    - in_use / idle: 현재 열린 커넥션 중 사용 중 / 유휴 (httpx 내부 구조를 읽을 수 없으면 None)
+    - wait_*_ms: 요청 시작부터 커넥션을 얻어 헤더를 보내기까지 걸린 시간
+    """
+    result = {}
+    for region in sorted(set(_clients) | set(_pool_waits)):
+        client = _clients.get(region)
+        pool = (0, 0)
+        if client is not None and not client.is_closed:
+            pool = _pool_connections(client)
+        opened, idle = pool if pool is not None else (None, None)
+        waits = _wait_stats(region)
+        requests = waits["requests"]
+        result[region] = {
+            "http2": HTTP2_ENABLED,
+            "connections": opened,
+            "in_use": opened - idle if pool is not None else None,
+            "idle": idle,
+            "in_flight": waits["in_flight"],
+            "requests": requests,
+            "wait_avg_ms": round(waits["wait_total"] / requests * 1000, 3) if requests else 0.0,
+            "wait_max_ms": round(waits["wait_max"] * 1000, 3),
+        }
+    return result
+
+
+async def get_request(endpoint: str, region: str = "kr", method: str | None = None, params: dict | None = None):
     """
     Riot API 호출 유틸 (비동기화)
     :param endpoint: 호출할 엔드포인트
     :param region: Riot API 지역
-    :return: JSON 응답
+    :param method: rate limit 버킷 이름 (예: "match-v5.matches"), 없으면 endpoint 사용
+    :param params: 쿼리 파라미터
+    :return: JSON 응답 (동시 호출자끼리 공유되는 객체)
     """
-    url = f"{BASE_URL_TEMPLATE.format(region=region)}{endpoint}"
-    print(f"[DEBUG] Async Request URL: {url}")
+    key = (region, endpoint, tuple(sorted((params or {}).items())))
+    return await SINGLE_FLIGHT.do(key, lambda: _fetch(endpoint, region, method or endpoint, params))
+
 
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(url, headers=HEADERS)
+async def _fetch(endpoint: str, region: str, method: str, params: dict | None):
+    for attempt in range(MAX_RETRIES + 1):
+        queued = time.perf_counter()
+        await RATE_LIMITER.acquire(region, method)
+        record_queue_wait("riot_rate_limit", time.perf_counter() - queued)
+        with timed("riot", method):
+            resp = await _send(endpoint, region, params)
+        await RATE_LIMITER.update(region, method, resp.headers, resp.status_code)
+        if resp.status_code != 429:
+            break
 
     if resp.status_code != 200:
         raise HTTPException(status_code=resp.status_code, detail=resp.text)
 
-    return resp.json()
+    return orjson.loads(resp.content)
+
+
+async def _send(endpoint: str, region: str, params: dict | None) -> httpx.Response:
+    client = get_client(region)
+    waits = _wait_stats(region)
+    started = time.perf_counter()
+    acquired = None
+
+    async def trace(event_name: str, info: dict):
+        # 첫 요청 헤더 전송 시점 = 커넥션 획득 완료 시점
+        nonlocal acquired
+        if acquired is None and event_name.endswith("send_request_headers.started"):
+            acquired = time.perf_counter() - started
+
+    waits["in_flight"] += 1
+    try:
+        resp = await client.get(endpoint, params=params, extensions={"trace": trace})
+    finally:
+        waits["in_flight"] -= 1
+        if acquired is not None:
+            record_queue_wait("riot_pool", acquired)
+            waits["requests"] += 1
+            waits["wait_total"] += acquired
+            waits["wait_max"] = max(waits["wait_max"], acquired)
+    return resp
@@ -0,0 +1,49 @@
+# utils/riot/batch.py
+import asyncio
+from typing import Awaitable, Callable
+from fastapi import HTTPException
+from models.batch import BatchRequestDTO
+from utils.riot.account import get_account_by_riot_id
+
+
+def split_riot_id(riot_id: str) -> tuple[str, str]:
+    game_name, sep, tag_line = riot_id.strip().rpartition("#")
+    if not sep or not game_name or not tag_line:
+        raise HTTPException(status_code=400, detail=f"invalid Riot ID (expected name#tag): {riot_id}")
+    return game_name, tag_line
+
+
+async def resolve_puuid(riot_id: str) -> str:
+    account = await get_account_by_riot_id(*split_riot_id(riot_id))
+    return account.puuid
+
+
+async def gather_partial(items: list[str], fn: Callable[[str], Awaitable]) -> list[dict]:
+    """
+    항목별로 동시에 fn 실행 (Riot 호출량은 공유 rate limiter 가 조절)
+    - 실패한 항목은 error 로 남기고 나머지 결과는 그대로 반환
+    """
+    results = await asyncio.gather(*[fn(item) for item in items], return_exceptions=True)
+    out = []
+    for item, result in zip(items, results):
+        if isinstance(result, HTTPException):
+            out.append({"input": item, "error": {"status": result.status_code, "detail": str(result.detail)}})
+        elif isinstance(result, Exception):
+            out.append({"input": item, "error": {"status": 500, "detail": str(result)}})
+        else:
+            out.append({"input": item, "result": result})
+    return out
+
+
+async def gather_by_player(req: BatchRequestDTO, fn: Callable[[str], Awaitable]) -> list[dict]:
+    """
+    riotIds 는 puuid 로 바꾼 뒤, puuids 는 그대로 fn(puuid) 실행 (riotIds → puuids 순서)
+    """
+    async def by_riot_id(riot_id: str):
+        return await fn(await resolve_puuid(riot_id))
+
+    riot_results, puuid_results = await asyncio.gather(
+        gather_partial(req.riotIds, by_riot_id),
+        gather_partial(req.puuids, fn),
+    )
+    return riot_results + puuid_results
@@ -0,0 +1,125 @@
+# utils/riot/cache.py
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+from utils.riot.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    stale-while-revalidate 캐시
+    - ttl 이내: 그대로 반환
+    - ttl 이후 stale_ttl 이내: 기존 값을 바로 반환하고 백그라운드에서 갱신
+    - 그 이후 / 없음: 로드가 끝날 때까지 대기 (같은 key 동시 로드는 하나로 합침)
+    - max_entries 를 넘으면 가장 오래 쓰지 않은 항목부터 제거
+    - shared(SharedCache) 가 있으면 메모리에 없거나 ttl 이 지난 key 를 다른 worker 가 저장한 값에서 먼저 찾고,
+      새로 받은 값은 공유 저장소에도 기록
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float, max_entries: int = 10000, clock=time.monotonic, shared=None):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.shared = shared
+        # key -> (value, stored_at)
+        self._entries: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        self._flight = SingleFlight()
+        self._refreshing: dict[Hashable, asyncio.Task] = {}
+        # 응답을 기다리지 않는 공유 저장소 쓰기
+        self._writes: set[asyncio.Task] = set()
+        self._stats = {
+            "hits": 0, "stale_hits": 0, "shared_hits": 0, "misses": 0,
+            "refreshes": 0, "refresh_errors": 0, "evictions": 0,
+        }
+
+    def _store(self, key: Hashable, value: Any, stored_at: float):
+        self._entries[key] = (value, stored_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    async def _put_shared(self, key: Hashable, value: Any):
+        try:
+            await self.shared.put(key, value, keep=self.ttl + self.stale_ttl)
+        except Exception as e:
+            logger.warning(f"shared cache write failed for {key}: {e}")
+
+    def set(self, key: Hashable, value: Any):
+        self._store(key, value, self.clock())
+        if self.shared is not None:
+            task = asyncio.create_task(self._put_shared(key, value))
+            self._writes.add(task)
+            task.add_done_callback(self._writes.discard)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable]):
+        value = await self._flight.do(key, loader)
+        self.set(key, value)
+        return value
+
+    async def _from_shared(self, key: Hashable, entry: tuple | None) -> tuple | None:
+        """
+        다른 worker 가 더 최근에 저장한 값이 있으면 메모리로 가져옴
+        """
+        try:
+            found = await self.shared.get(key)
+        except Exception as e:
+            logger.warning(f"shared cache read failed for {key}: {e}")
+            return entry
+        if found is None:
+            return entry
+        value, age = found
+        stored_at = self.clock() - age
+        if entry is not None and entry[1] >= stored_at:
+            return entry
+        self._store(key, value, stored_at)
+        self._stats["shared_hits"] += 1
+        return value, stored_at
+
+    async def _refresh(self, key: Hashable, loader: Callable[[], Awaitable]):
+        try:
+            await self._load(key, loader)
+            self._stats["refreshes"] += 1
+        except Exception as e:
+            # 갱신 실패 시 stale 값을 계속 사용
+            self._stats["refresh_errors"] += 1
+            logger.warning(f"cache refresh failed for {key}: {e}")
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable]):
+        entry = self._entries.get(key)
+        if self.shared is not None and (entry is None or self.clock() - entry[1] >= self.ttl):
+            entry = await self._from_shared(key, entry)
+        if entry is not None:
+            value, stored_at = entry
+            age = self.clock() - stored_at
+            if age < self.ttl:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self._entries.move_to_end(key)
+                self._stats["stale_hits"] += 1
+                if key not in self._refreshing:
+                    task = asyncio.create_task(self._refresh(key, loader))
+                    self._refreshing[key] = task
+                    task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+                return value
+
+        self._stats["misses"] += 1
+        return await self._load(key, loader)
+
+    def stats(self) -> dict:
+        lookups = self._stats["hits"] + self._stats["stale_hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "hit_ratio": round((lookups - self._stats["misses"]) / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+            "refreshing": len(self._refreshing),
+            "shared": self.shared is not None,
+        }
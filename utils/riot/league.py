@@ -1,6 +1,22 @@
-from utils.riot.base import get_request
+import os
+from dotenv import load_dotenv
+from utils.riot.base import get_request, shared_cache
+from utils.riot.cache import TTLCache
 from models.league import LeagueEntryDTO
 
-async def get_league_entry_by_puuid(puuid: str):
+load_dotenv()
+
+# 랭크 정보는 게임이 끝날 때마다 바뀌므로 짧게 캐시
+LEAGUE_CACHE = TTLCache(
+    ttl=float(os.getenv("LEAGUE_CACHE_TTL", "300")),
+    stale_ttl=float(os.getenv("LEAGUE_CACHE_STALE_TTL", "3600")),
+    max_entries=int(os.getenv("LEAGUE_CACHE_SIZE", "10000")),
+    shared=shared_cache("league"),
+)
+
+async def _fetch_league_entry_by_puuid(puuid: str):
     endpoint = f"/lol/league/v4/entries/by-puuid/{puuid}"
-    return await get_request(endpoint)
\ No newline at end of file
+    return await get_request(endpoint, method="league-v4.entries-by-puuid")
+
+async def get_league_entry_by_puuid(puuid: str):
+    return await LEAGUE_CACHE.get_or_load(puuid, lambda: _fetch_league_entry_by_puuid(puuid))
\ No newline at end of file
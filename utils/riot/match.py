@@ -1,24 +1,166 @@
 # utils/riot/match.py
+import os
+import time
 import asyncio
+from dotenv import load_dotenv
 from utils.riot.base import get_request
+from utils.riot.match_store import MatchStore
+from utils.riot.singleflight import SingleFlight
 from models.match import MatchDto
 
-# 한 번에 5개만 병렬 호출 (Riot rate limit safe)
-SEMAPHORE = asyncio.Semaphore(5)
+load_dotenv()
 
+# 동시 호출량은 utils/riot/base.py 의 RATE_LIMITER 가 Riot 응답 헤더 기준으로 조절
 
-async def get_match_ids_by_puuid(puuid: str):
+# match-v5 는 끝난 경기만 돌려주므로 한 번 받은 상세는 그대로 재사용
+MATCH_STORE = MatchStore(
+    os.getenv("MATCH_STORE_PATH", "./match_store.sqlite3"),
+    max_memory=int(os.getenv("MATCH_STORE_MEMORY", "256")),
+    max_rows=int(os.getenv("MATCH_STORE_MAX_ROWS", "20000")),
+)
+
+# 경기 id 목록 한 페이지 최대 크기 (Riot 상한 100)
+HISTORY_PAGE_SIZE = 100
+# 이 시간 안에 다시 동기화하지 않음 (초)
+HISTORY_SYNC_INTERVAL = float(os.getenv("MATCH_HISTORY_SYNC_INTERVAL", "60"))
+# 직전 동기화 때 진행 중이던 게임을 놓치지 않도록 startTime 을 앞당기는 여유 (초)
+HISTORY_SYNC_SLACK = 3600
+
+# puuid 별 동기화/과거 페이지 조회는 각각 한 번에 하나만
+HISTORY_SYNC = SingleFlight()
+
+
+async def get_match_ids_by_puuid(puuid: str, start: int = 0, count: int = 20,
+                                 start_time: int | None = None, end_time: int | None = None,
+                                 queue: int | None = None, type: str | None = None):
     endpoint = f"/lol/match/v5/matches/by-puuid/{puuid}/ids"
-    return await get_request(endpoint, "asia")
+    params = {"start": start, "count": count}
+    for key, value in (("startTime", start_time), ("endTime", end_time), ("queue", queue), ("type", type)):
+        if value is not None:
+            params[key] = value
+    return await get_request(endpoint, "asia", method="match-v5.ids-by-puuid", params=params)
 
 
-async def get_match_detail_by_match_id(match_id: str):
+async def _sync_match_history(puuid: str, initial: int):
+    _, cursor = await MATCH_STORE.get_history(puuid, 0)
+    now = time.time()
+    if cursor is None:
+        # 처음 보는 puuid: 필요한 만큼만 최신 페이지를 받음
+        count = max(1, min(initial, HISTORY_PAGE_SIZE))
+        ids = await get_match_ids_by_puuid(puuid, count=count)
+        await MATCH_STORE.add_history(puuid, ids, newer=True, synced_at=now, complete=len(ids) < count)
+        return
+    if now - cursor["synced_at"] < HISTORY_SYNC_INTERVAL:
+        return
+
+    # 마지막 동기화 이후 시작된 경기만 페이지 단위로 받음 (보통 한 번 호출로 끝남)
+    start_time = int(cursor["synced_at"] - HISTORY_SYNC_SLACK)
+    new_ids = []
+    while True:
+        page = await get_match_ids_by_puuid(puuid, start=len(new_ids), count=HISTORY_PAGE_SIZE, start_time=start_time)
+        new_ids.extend(page)
+        if len(page) < HISTORY_PAGE_SIZE:
+            break
+    await MATCH_STORE.add_history(puuid, new_ids, newer=True, synced_at=now)
+
+
+async def sync_match_history(puuid: str, initial: int = 20):
+    """
+    로컬에 저장된 경기 id 목록을 Riot 최신 상태로 맞춤
+    :param initial: 처음 동기화할 때 받아올 최신 경기 수
+    """
+    await HISTORY_SYNC.do(("sync", puuid), lambda: _sync_match_history(puuid, initial))
+
+
+async def _extend_match_history(puuid: str, count: int):
+    ids, cursor = await MATCH_STORE.get_history(puuid, count)
+    known = cursor["count"]
+    while known < count and not cursor["complete"]:
+        # 로컬 목록은 최신 경기부터 빈틈없이 이어지므로 start=보유 개수 부터가 다음 과거 페이지
+        size = min(HISTORY_PAGE_SIZE, count - known)
+        page = await get_match_ids_by_puuid(puuid, start=known, count=size)
+        cursor["complete"] = len(page) < size
+        await MATCH_STORE.add_history(puuid, page, newer=False, complete=cursor["complete"])
+        known += len(page)
+
+
+async def get_match_history(puuid: str, count: int = 20) -> list[str]:
+    """
+    최신순 경기 id 최대 count 개
+    - 새 경기만 증분 동기화하고, 로컬에 부족한 과거 경기는 필요할 때만 페이지로 받아 저장
+    """
+    await sync_match_history(puuid, initial=count)
+    ids, cursor = await MATCH_STORE.get_history(puuid, count)
+    # 다른 요청의 더 짧은 조회에 합쳐졌을 수 있으므로 채워질 때까지 반복
+    while len(ids) < count and not cursor["complete"]:
+        await HISTORY_SYNC.do(("extend", puuid), lambda: _extend_match_history(puuid, count))
+        ids, cursor = await MATCH_STORE.get_history(puuid, count)
+    return ids
+
+
+async def _fetch_match_data(match_id: str) -> dict:
     endpoint = f"/lol/match/v5/matches/{match_id}"
-    data = await get_request(endpoint, "asia")
-    return MatchDto(**data)
+    data = await get_request(endpoint, "asia", method="match-v5.match")
+    await MATCH_STORE.put(match_id, data)
+    return data
+
+
+async def get_match_data(match_id: str) -> dict:
+    """캐시 우선, 없을 때만 Riot 호출 (원본 JSON dict)"""
+    data = await MATCH_STORE.get(match_id)
+    if data is None:
+        data = await _fetch_match_data(match_id)
+    return data
+
+
+async def get_match_data_many(match_ids: list[str]) -> list[dict]:
+    """캐시에 없는 id 만 병렬로 Riot 호출, 요청 순서대로 반환"""
+    cached = await MATCH_STORE.get_many(match_ids)
+    missing = [mid for mid in dict.fromkeys(match_ids) if mid not in cached]
+    fetched = await asyncio.gather(*[_fetch_match_data(mid) for mid in missing])
+    cached.update(zip(missing, fetched))
+    return [cached[mid] for mid in match_ids]
 
 
-async def limited_match_detail(match_id: str):
-    """Semaphore로 동시 호출량 제한"""
-    async with SEMAPHORE:
-        return await get_match_detail_by_match_id(match_id)
+async def iter_match_data(match_ids: list[str], ordered: bool = False, window: int = 10):
+    """
+    경기 상세를 받는 대로 (index, match_id, data, error) 로 하나씩 넘김
+    :param ordered: True 면 요청 순서, False 면 완료 순서
+    :param window: 동시에 받아오거나 순서 대기 중인 경기 수 상한 (메모리 일정하게 유지)
+    """
+    queue = iter(enumerate(match_ids))
+    pending: dict[asyncio.Task, int] = {}
+    ready: dict[int, tuple] = {}
+    next_index = 0
+
+    def fill():
+        while len(pending) + len(ready) < window:
+            item = next(queue, None)
+            if item is None:
+                return
+            pending[asyncio.ensure_future(get_match_data(item[1]))] = item[0]
+
+    try:
+        fill()
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index = pending.pop(task)
+                error = task.exception()
+                result = (index, match_ids[index], None if error else task.result(), error)
+                if ordered:
+                    ready[index] = result
+                else:
+                    yield result
+            while next_index in ready:
+                yield ready.pop(next_index)
+                next_index += 1
+            fill()
+    finally:
+        # 클라이언트가 끊기면 남은 호출 취소
+        for task in pending:
+            task.cancel()
+
+
+async def get_match_detail_by_match_id(match_id: str):
+    return MatchDto(**await get_match_data(match_id))
@@ -0,0 +1,145 @@
+# utils/riot/match_store.py
+import asyncio
+import sqlite3
+import threading
+import time
+import zlib
+
+import orjson
+
+from utils.lru_store import LRUTable
+
+
+class MatchStore:
+    """
+    종료된 경기(MatchDto 원본 JSON)는 바뀌지 않으므로 match_id 로 영구 저장
+    - 메모리 LRU (max_memory 개) → SQLite (zlib 압축, max_rows 개) 순서로 조회 (LRUTable)
+    - 반환되는 dict 는 캐시와 공유되므로 호출 측에서 수정하지 않아야 함
+    - puuid 별 경기 id 목록(최신순)과 동기화 커서도 함께 보관
+    """
+
+    def __init__(self, path: str, max_memory: int = 256, max_rows: int = 20000):
+        self.path = path
+        self._lru = LRUTable("matches", "match_id", "data", max_memory, max_rows)
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    # ------------------------
+    # SQLite (스레드에서 실행)
+    # ------------------------
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS matches ("
+                "match_id TEXT PRIMARY KEY, data BLOB NOT NULL, "
+                "stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            # ord 가 클수록 최근 경기
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS match_history ("
+                "puuid TEXT NOT NULL, match_id TEXT NOT NULL, ord INTEGER NOT NULL, "
+                "PRIMARY KEY (puuid, match_id))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS match_history_ord ON match_history(puuid, ord)")
+            # synced_at: 마지막 동기화 시각(epoch 초), complete: 가장 오래된 경기까지 받았는지
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS history_cursor ("
+                "puuid TEXT PRIMARY KEY, synced_at REAL NOT NULL, complete INTEGER NOT NULL)"
+            )
+            self._lru.attach(conn)
+            self._conn = conn
+        return self._conn
+
+    def _load(self, match_ids: list[str]) -> dict[str, dict]:
+        with self._lock:
+            rows = self._lru.load(self._db(), match_ids)
+        return {match_id: orjson.loads(zlib.decompress(blob)) for match_id, blob in rows}
+
+    def _save(self, match_id: str, blob: bytes):
+        with self._lock:
+            self._lru.save(self._db(), [(match_id, blob)], stored_at=time.time())
+
+    def _load_history(self, puuid: str, limit: int) -> tuple[list[str], dict | None]:
+        with self._lock:
+            db = self._db()
+            ids = [r[0] for r in db.execute(
+                "SELECT match_id FROM match_history WHERE puuid = ? ORDER BY ord DESC LIMIT ?", (puuid, limit)
+            )]
+            row = db.execute("SELECT synced_at, complete FROM history_cursor WHERE puuid = ?", (puuid,)).fetchone()
+            if row is None:
+                return ids, None
+            count = db.execute("SELECT COUNT(*) FROM match_history WHERE puuid = ?", (puuid,)).fetchone()[0]
+        return ids, {"synced_at": row[0], "complete": bool(row[1]), "count": count}
+
+    def _save_history(self, puuid: str, match_ids: list[str], newer: bool, synced_at: float | None, complete: bool | None):
+        with self._lock:
+            db = self._db()
+            known = {r[0] for r in db.execute("SELECT match_id FROM match_history WHERE puuid = ?", (puuid,))}
+            fresh = [mid for mid in dict.fromkeys(match_ids) if mid not in known]
+            low, high = db.execute(
+                "SELECT COALESCE(MIN(ord), 0), COALESCE(MAX(ord), 0) FROM match_history WHERE puuid = ?", (puuid,)
+            ).fetchone()
+            # match_ids 는 최신순: 새 경기는 high 위로, 과거 경기는 low 아래로 쌓음
+            if newer:
+                rows = [(puuid, mid, high + len(fresh) - i) for i, mid in enumerate(fresh)]
+            else:
+                rows = [(puuid, mid, low - 1 - i) for i, mid in enumerate(fresh)]
+            db.executemany("INSERT INTO match_history (puuid, match_id, ord) VALUES (?, ?, ?)", rows)
+            if synced_at is not None or complete is not None:
+                row = db.execute("SELECT synced_at, complete FROM history_cursor WHERE puuid = ?", (puuid,)).fetchone()
+                prev_synced, prev_complete = row if row else (0.0, 0)
+                db.execute(
+                    "INSERT OR REPLACE INTO history_cursor (puuid, synced_at, complete) VALUES (?, ?, ?)",
+                    (puuid, synced_at if synced_at is not None else prev_synced,
+                     int(complete if complete is not None else prev_complete)),
+                )
+            db.commit()
+
+    async def get_history(self, puuid: str, limit: int) -> tuple[list[str], dict | None]:
+        """
+        저장된 최신순 경기 id 최대 limit 개와 커서 (동기화한 적 없으면 None)
+        """
+        return await asyncio.to_thread(self._load_history, puuid, limit)
+
+    async def add_history(self, puuid: str, match_ids: list[str], newer: bool,
+                          synced_at: float | None = None, complete: bool | None = None):
+        """
+        newer=True 면 기존 목록보다 최근 경기, False 면 더 오래된 경기로 추가 (이미 있는 id 는 무시)
+        """
+        await asyncio.to_thread(self._save_history, puuid, match_ids, newer, synced_at, complete)
+
+    # ------------------------
+    # 메모리 LRU → SQLite
+    # ------------------------
+    async def get_many(self, match_ids: list[str]) -> dict[str, dict]:
+        """
+        저장된 경기만 반환 (없는 id 는 결과에서 빠짐)
+        """
+        found, missing = self._lru.lookup(match_ids)
+        if missing:
+            loaded = await asyncio.to_thread(self._load, missing)
+            for match_id, data in loaded.items():
+                self._lru.remember(match_id, data)
+            found.update(loaded)
+        return found
+
+    async def get(self, match_id: str) -> dict | None:
+        return (await self.get_many([match_id])).get(match_id)
+
+    async def put(self, match_id: str, data: dict):
+        self._lru.remember(match_id, data)
+        blob = zlib.compress(orjson.dumps(data))
+        await asyncio.to_thread(self._save, match_id, blob)
+        self._writes += 1
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> dict:
+        return {**self._lru.stats(), "writes": self._writes}
@@ -0,0 +1,224 @@
+# utils/riot/ratelimit.py
+import asyncio
+import time
+from collections import defaultdict
+
+
+def parse_limits(value: str | None) -> list[tuple[int, int]]:
+    """
+    "20:1,100:120" -> [(20, 1), (100, 120)]  (count, seconds)
+    """
+    pairs = []
+    for part in (value or "").split(","):
+        count, _, seconds = part.strip().partition(":")
+        if count.isdigit() and seconds.isdigit():
+            pairs.append((int(count), int(seconds)))
+    return pairs
+
+
+class TokenBucket:
+    """
+    Riot 방식 고정 윈도우 버킷
+    - 윈도우 첫 요청 시점부터 seconds 동안 limit 개 토큰
+    - 윈도우가 끝나면 한 번에 다시 채워짐
+    """
+
+    __slots__ = ("limit", "seconds", "used", "reset_at")
+
+    def __init__(self, limit: int, seconds: int):
+        self.limit = limit
+        self.seconds = seconds
+        self.used = 0
+        self.reset_at = 0.0
+
+    def _refill(self, now: float):
+        if now >= self.reset_at:
+            self.used = 0
+            self.reset_at = 0.0
+
+    def wait_time(self, now: float) -> float:
+        self._refill(now)
+        if self.used < self.limit:
+            return 0.0
+        return self.reset_at - now
+
+    def take(self, now: float):
+        self._refill(now)
+        if not self.reset_at:
+            self.reset_at = now + self.seconds
+        self.used += 1
+
+    def sync(self, server_count: int, now: float):
+        # 서버가 본 사용량이 더 크면 (다른 프로세스/재시작 등) 그 값을 따름
+        self._refill(now)
+        if server_count > self.used:
+            self.used = server_count
+            if not self.reset_at:
+                self.reset_at = now + self.seconds
+
+
+class RateLimiter:
+    """
+    region 별 app limit + (region, method) 별 method limit 스케줄러
+    - 응답 헤더(X-*-Rate-Limit / *-Count)로 한도와 사용량을 갱신
+    - 429 의 Retry-After 동안 해당 범위를 막음
+    - method 단위 FIFO 대기열 → region 단위 FIFO 대기열 순서로 공정하게 토큰 배분
+    - backend(SharedState) 가 있으면 버킷 사용량 / 차단을 같은 호스트의 다른 worker 와 공유
+      (한도는 각 worker 가 응답 헤더로 알아낸 값, 대기열 순서는 worker 안에서만 보장)
+    """
+
+    def __init__(self, default_app_limits: str = "20:1,100:120", clock=time.monotonic, backend=None):
+        self.default_app_limits = parse_limits(default_app_limits)
+        self.clock = clock
+        self.backend = backend
+        self._buckets: dict[tuple, list[TokenBucket]] = {}
+        self._blocked_until: dict[tuple, float] = {}
+        self._locks: dict[tuple, asyncio.Lock] = {}
+        self._stats = defaultdict(lambda: {"requests": 0, "throttled": 0, "wait_total": 0.0, "rate_limited": 0})
+
+    def _lock(self, scope: tuple) -> asyncio.Lock:
+        lock = self._locks.get(scope)
+        if lock is None:
+            lock = self._locks[scope] = asyncio.Lock()
+        return lock
+
+    def _scope_buckets(self, scope: tuple) -> list[TokenBucket]:
+        buckets = self._buckets.get(scope)
+        if buckets is None:
+            limits = self.default_app_limits if scope[0] == "app" else []
+            buckets = self._buckets[scope] = [TokenBucket(c, s) for c, s in limits]
+        return buckets
+
+    def _wait_time(self, scope: tuple, now: float) -> float:
+        wait = self._blocked_until.get(scope, 0.0) - now
+        for bucket in self._scope_buckets(scope):
+            wait = max(wait, bucket.wait_time(now))
+        return wait
+
+    async def _wait_for(self, scopes: tuple, stats: dict):
+        while True:
+            now = self.clock()
+            wait = max(self._wait_time(scope, now) for scope in scopes)
+            if wait <= 0:
+                return
+            stats["throttled"] += 1
+            stats["wait_total"] += wait
+            await asyncio.sleep(wait)
+
+    @staticmethod
+    def _scope_name(scope: tuple) -> str:
+        return ":".join(scope)
+
+    async def _wait_shared(self, scopes: tuple, stats: dict, take: bool):
+        while True:
+            limits = [
+                (self._scope_name(scope), [(b.limit, b.seconds) for b in self._scope_buckets(scope)])
+                for scope in scopes
+            ]
+            wait = await self.backend.reserve(limits, take=take)
+            if wait <= 0:
+                return
+            stats["throttled"] += 1
+            stats["wait_total"] += wait
+            await asyncio.sleep(wait)
+
+    async def acquire(self, region: str, method: str):
+        app_scope = ("app", region)
+        method_scope = ("method", region, method)
+        stats = self._stats[f"{region}:{method}"]
+        stats["requests"] += 1
+
+        # method 대기열 선두만 region 대기열에 들어가므로
+        # 한 method 가 막혀도 같은 region 의 다른 method 는 계속 진행됨
+        async with self._lock(method_scope):
+            if self.backend is not None:
+                # 확인과 차감을 공유 저장소의 한 트랜잭션에서 처리
+                await self._wait_shared((method_scope,), stats, take=False)
+                async with self._lock(app_scope):
+                    await self._wait_shared((app_scope, method_scope), stats, take=True)
+                return
+            await self._wait_for((method_scope,), stats)
+            async with self._lock(app_scope):
+                await self._wait_for((app_scope, method_scope), stats)
+                now = self.clock()
+                for scope in (app_scope, method_scope):
+                    for bucket in self._scope_buckets(scope):
+                        bucket.take(now)
+
+    def _apply_headers(self, scope: tuple, limits_header: str | None, counts_header: str | None, now: float):
+        limits = parse_limits(limits_header)
+        if limits:
+            current = {b.seconds: b for b in self._scope_buckets(scope)}
+            buckets = []
+            for count, seconds in limits:
+                bucket = current.get(seconds) or TokenBucket(count, seconds)
+                bucket.limit = count
+                buckets.append(bucket)
+            self._buckets[scope] = buckets
+        counts = dict((seconds, count) for count, seconds in parse_limits(counts_header))
+        for bucket in self._scope_buckets(scope):
+            if bucket.seconds in counts:
+                bucket.sync(counts[bucket.seconds], now)
+
+    async def update(self, region: str, method: str, headers, status_code: int):
+        """
+        응답 헤더로 한도/사용량 갱신, 429 면 Retry-After 만큼 차단
+        """
+        block = self._update_local(region, method, headers, status_code)
+        if self.backend is None:
+            return
+        counts = {}
+        for scope, header in ((("app", region), "X-App-Rate-Limit-Count"),
+                              (("method", region, method), "X-Method-Rate-Limit-Count")):
+            by_seconds = {seconds: count for count, seconds in parse_limits(headers.get(header))}
+            if by_seconds:
+                counts[self._scope_name(scope)] = by_seconds
+        if block is not None:
+            # 다른 worker 의 clock 과 비교할 수 있도록 epoch 초로 변환
+            scope, retry_after = block
+            block = (self._scope_name(scope), time.time() + retry_after)
+        if counts or block is not None:
+            await self.backend.sync(counts, block)
+
+    def _update_local(self, region: str, method: str, headers, status_code: int) -> tuple | None:
+        """
+        이 worker 의 버킷 갱신, 429 면 (차단 scope, Retry-After 초) 반환
+        """
+        now = self.clock()
+        app_scope = ("app", region)
+        method_scope = ("method", region, method)
+        self._apply_headers(app_scope, headers.get("X-App-Rate-Limit"), headers.get("X-App-Rate-Limit-Count"), now)
+        self._apply_headers(method_scope, headers.get("X-Method-Rate-Limit"), headers.get("X-Method-Rate-Limit-Count"), now)
+
+        if status_code != 429:
+            return None
+        self._stats[f"{region}:{method}"]["rate_limited"] += 1
+        try:
+            retry_after = float(headers.get("Retry-After", 1))
+        except ValueError:
+            retry_after = 1.0
+        # application 한도 초과면 region 전체, 그 외(method/service)는 해당 method 만 차단
+        limit_type = (headers.get("X-Rate-Limit-Type") or "").lower()
+        scope = app_scope if limit_type == "application" else method_scope
+        self._blocked_until[scope] = max(self._blocked_until.get(scope, 0.0), now + retry_after)
+        return scope, retry_after
+
+    def stats(self) -> dict:
+        now = self.clock()
+        scopes = {}
+        for scope, buckets in self._buckets.items():
+            name = ":".join(scope[1:]) if scope[0] == "method" else scope[1]
+            scopes[f"{scope[0]}:{name}"] = {
+                "limits": [f"{b.limit}:{b.seconds}" for b in buckets],
+                "used": [b.used if b.reset_at > now else 0 for b in buckets],
+                "blocked_for": round(max(0.0, self._blocked_until.get(scope, 0.0) - now), 3),
+            }
+        methods = {
+            key: {**value, "wait_total": round(value["wait_total"], 3)}
+            for key, value in self._stats.items()
+        }
+        result = {"scopes": scopes, "methods": methods}
+        if self.backend is not None:
+            # scopes 의 used / blocked_for 는 이 worker 기준, 실제 차감은 공유 저장소
+            result["shared"] = self.backend.stats()
+        return result
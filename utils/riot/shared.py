@@ -0,0 +1,248 @@
+# utils/riot/shared.py
+import asyncio
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Hashable
+
+import orjson
+
+
+class SharedState:
+    """
+    한 호스트의 uvicorn worker 들이 같이 쓰는 Riot 클라이언트 상태 (SQLite WAL 파일 하나)
+    - rate limit 버킷 사용량 / Retry-After 차단: BEGIN IMMEDIATE (파일 쓰기 잠금) 안에서 확인과 차감을 한 번에
+    - TTL 캐시 항목: (namespace, key) -> 직렬화된 값, 저장 시각
+    - lease: 한 worker 만 해야 하는 작업(패치 prewarm, 챔피언 문서 갱신)의 소유자와 만료 시각
+    - 시각은 프로세스끼리 비교할 수 있도록 epoch 초(time.time) 기준
+    - SQLite 호출은 스레드에서 실행 (asyncio.to_thread)
+    """
+
+    def __init__(self, path: str, busy_timeout: float = 5.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        # lease 소유자 이름 (worker 프로세스마다 다름)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._stats = {
+            "reserves": 0, "throttled": 0, "syncs": 0, "blocks": 0,
+            "cache_hits": 0, "cache_misses": 0, "cache_writes": 0, "cache_pruned": 0,
+            "lock_wait_total": 0.0, "lock_wait_max": 0.0,
+        }
+
+    # ------------------------
+    # SQLite (스레드에서 실행)
+    # ------------------------
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # 트랜잭션은 직접 BEGIN IMMEDIATE 로 시작
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # scope: "app:kr" / "method:kr:match-v5.match"
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_buckets ("
+                "scope TEXT NOT NULL, seconds INTEGER NOT NULL, used INTEGER NOT NULL, reset_at REAL NOT NULL, "
+                "PRIMARY KEY (scope, seconds))"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS rate_blocks (scope TEXT PRIMARY KEY, until REAL NOT NULL)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, stored_at REAL NOT NULL, "
+                "PRIMARY KEY (namespace, key))"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS leases (name TEXT PRIMARY KEY, owner TEXT NOT NULL, until REAL NOT NULL)")
+            self._conn = conn
+        return self._conn
+
+    def _write(self, fn: Callable[[sqlite3.Connection], Any]):
+        """
+        다른 worker 와 겹치지 않도록 쓰기 잠금을 먼저 잡고 fn 실행
+        """
+        with self._lock:
+            db = self._db()
+            started = time.perf_counter()
+            db.execute("BEGIN IMMEDIATE")
+            waited = time.perf_counter() - started
+            self._stats["lock_wait_total"] += waited
+            self._stats["lock_wait_max"] = max(self._stats["lock_wait_max"], waited)
+            try:
+                result = fn(db)
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+            return result
+
+    def _reserve(self, scopes: list[tuple[str, list[tuple[int, int]]]], take: bool) -> float:
+        def run(db: sqlite3.Connection) -> float:
+            now = time.time()
+            wait = 0.0
+            rows = []
+            for scope, limits in scopes:
+                blocked = db.execute("SELECT until FROM rate_blocks WHERE scope = ?", (scope,)).fetchone()
+                if blocked:
+                    wait = max(wait, blocked[0] - now)
+                for limit, seconds in limits:
+                    row = db.execute(
+                        "SELECT used, reset_at FROM rate_buckets WHERE scope = ? AND seconds = ?", (scope, seconds)
+                    ).fetchone()
+                    used, reset_at = row if row and now < row[1] else (0, 0.0)
+                    if used >= limit:
+                        wait = max(wait, reset_at - now)
+                    rows.append((scope, seconds, used + 1, reset_at or now + seconds))
+            if take and wait <= 0:
+                db.executemany(
+                    "INSERT OR REPLACE INTO rate_buckets (scope, seconds, used, reset_at) VALUES (?, ?, ?, ?)", rows
+                )
+            return wait
+
+        wait = self._write(run)
+        self._stats["reserves"] += 1
+        if wait > 0:
+            self._stats["throttled"] += 1
+        return wait
+
+    def _sync(self, counts: dict[str, dict[int, int]], block: tuple[str, float] | None):
+        def run(db: sqlite3.Connection):
+            now = time.time()
+            for scope, by_seconds in counts.items():
+                for seconds, count in by_seconds.items():
+                    row = db.execute(
+                        "SELECT used, reset_at FROM rate_buckets WHERE scope = ? AND seconds = ?", (scope, seconds)
+                    ).fetchone()
+                    used, reset_at = row if row and now < row[1] else (0, 0.0)
+                    # 서버가 본 사용량이 더 크면 (재시작 / 같은 키를 쓰는 다른 호스트) 그 값을 따름
+                    if count > used:
+                        db.execute(
+                            "INSERT OR REPLACE INTO rate_buckets (scope, seconds, used, reset_at) VALUES (?, ?, ?, ?)",
+                            (scope, seconds, count, reset_at or now + seconds),
+                        )
+            if block is not None:
+                scope, until = block
+                db.execute(
+                    "INSERT INTO rate_blocks (scope, until) VALUES (?, ?) "
+                    "ON CONFLICT(scope) DO UPDATE SET until = MAX(until, excluded.until)",
+                    (scope, until),
+                )
+
+        self._write(run)
+        self._stats["syncs"] += 1
+        if block is not None:
+            self._stats["blocks"] += 1
+
+    def _cache_get(self, namespace: str, key: str) -> tuple[bytes, float] | None:
+        with self._lock:
+            row = self._db().execute(
+                "SELECT value, stored_at FROM cache WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+        self._stats["cache_hits" if row else "cache_misses"] += 1
+        return row
+
+    def _cache_put(self, namespace: str, key: str, value: bytes, keep: float | None):
+        def run(db: sqlite3.Connection):
+            now = time.time()
+            db.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, stored_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, value, now),
+            )
+            self._stats["cache_writes"] += 1
+            # 가끔씩 오래된 항목 정리 (stale 기간까지 지난 값은 어느 worker 도 쓰지 않음)
+            if keep is not None and self._stats["cache_writes"] % 256 == 0:
+                cur = db.execute("DELETE FROM cache WHERE namespace = ? AND stored_at < ?", (namespace, now - keep))
+                self._stats["cache_pruned"] += cur.rowcount
+
+        self._write(run)
+
+    def _acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        def run(db: sqlite3.Connection) -> bool:
+            now = time.time()
+            row = db.execute("SELECT owner, until FROM leases WHERE name = ?", (name,)).fetchone()
+            if row and row[0] != owner and row[1] > now:
+                return False
+            db.execute("INSERT OR REPLACE INTO leases (name, owner, until) VALUES (?, ?, ?)", (name, owner, now + ttl))
+            return True
+
+        return self._write(run)
+
+    def _release_lease(self, name: str, owner: str):
+        self._write(lambda db: db.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner)))
+
+    # ------------------------
+    # async API
+    # ------------------------
+    async def reserve(self, scopes: list[tuple[str, list[tuple[int, int]]]], take: bool = True) -> float:
+        """
+        모든 scope 에 여유가 있으면 (take=True 일 때) 토큰을 하나씩 차감하고 0, 아니면 기다려야 할 초
+        :param scopes: [(scope, [(limit, seconds), ...]), ...]
+        """
+        return await asyncio.to_thread(self._reserve, scopes, take)
+
+    async def sync(self, counts: dict[str, dict[int, int]], block: tuple[str, float] | None = None):
+        """
+        응답 헤더의 사용량({scope: {seconds: count}})과 429 차단(scope, 해제 epoch 초)을 반영
+        """
+        await asyncio.to_thread(self._sync, counts, block)
+
+    async def cache_get(self, namespace: str, key: str) -> tuple[bytes, float] | None:
+        return await asyncio.to_thread(self._cache_get, namespace, key)
+
+    async def cache_put(self, namespace: str, key: str, value: bytes, keep: float | None = None):
+        await asyncio.to_thread(self._cache_put, namespace, key, value, keep)
+
+    async def acquire_lease(self, name: str, ttl: float) -> bool:
+        """
+        이 worker 가 name 작업을 ttl 초 동안 맡음 (다른 worker 의 lease 가 살아 있으면 False, 내 lease 면 연장)
+        """
+        return await asyncio.to_thread(self._acquire_lease, name, self.worker_id, ttl)
+
+    async def release_lease(self, name: str):
+        await asyncio.to_thread(self._release_lease, name, self.worker_id)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            **self._stats,
+            "lock_wait_total": round(self._stats["lock_wait_total"], 3),
+            "lock_wait_max": round(self._stats["lock_wait_max"], 3),
+        }
+
+
+class SharedCache:
+    """
+    TTLCache 의 worker 간 공유 계층 (namespace 하나)
+    - key 는 JSON 문자열, 값은 dumps / loads 로 직렬화
+    """
+
+    def __init__(self, state: SharedState, namespace: str,
+                 dumps: Callable[[Any], bytes] = orjson.dumps, loads: Callable[[bytes], Any] = orjson.loads):
+        self.state = state
+        self.namespace = namespace
+        self.dumps = dumps
+        self.loads = loads
+
+    @staticmethod
+    def _key(key: Hashable) -> str:
+        return orjson.dumps(key).decode()
+
+    async def get(self, key: Hashable) -> tuple[Any, float] | None:
+        """
+        (값, 저장된 지 몇 초) 또는 None
+        """
+        row = await self.state.cache_get(self.namespace, self._key(key))
+        if row is None:
+            return None
+        value, stored_at = row
+        return self.loads(value), max(0.0, time.time() - stored_at)
+
+    async def put(self, key: Hashable, value: Any, keep: float | None = None):
+        await self.state.cache_put(self.namespace, self._key(key), self.dumps(value), keep)
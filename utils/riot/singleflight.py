@@ -0,0 +1,38 @@
+# utils/riot/singleflight.py
+import asyncio
+from typing import Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """
+    같은 key 로 동시에 들어온 호출을 하나의 upstream 작업으로 합침
+    - 첫 호출(leader)만 fn 을 실행하고 나머지는 같은 결과를 기다림
+    - 결과 객체는 공유되므로 호출 측에서 수정하지 않아야 함
+    - 한 호출자가 취소돼도 작업은 다른 호출자를 위해 계속 진행
+    """
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self._stats = {"calls": 0, "leaders": 0, "coalesced": 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable]):
+        self._stats["calls"] += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self._stats["leaders"] += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            self._stats["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 기다리던 호출자가 모두 취소된 경우 경고가 남지 않도록 예외를 회수
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        return {**self._stats, "in_flight": len(self._inflight)}
@@ -0,0 +1,167 @@
+# utils/riot/stats.py
+import numpy as np
+
+# (열 이름, dtype, 원본 ParticipantDto 필드)
+_INT_COLUMNS = (
+    ("team_id", np.int16, "teamId"),
+    ("kills", np.int16, "kills"),
+    ("deaths", np.int16, "deaths"),
+    ("assists", np.int16, "assists"),
+    ("minions", np.int32, "totalMinionsKilled"),
+    ("neutral", np.int32, "neutralMinionsKilled"),
+    ("damage", np.int32, "totalDamageDealtToChampions"),
+    ("gold", np.int32, "goldEarned"),
+)
+
+
+class _Interner:
+    """문자열 -> 정수 코드 사전 (챔피언/포지션 열을 int 배열로 보관)"""
+
+    def __init__(self):
+        self.codes: dict[str, int] = {}
+        self.names: list[str] = []
+
+    def __call__(self, value: str | None) -> int:
+        value = value or ""
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.names)
+            self.names.append(value)
+        return code
+
+
+class ParticipantColumns:
+    """
+    여러 경기의 참가자 행을 열 단위 NumPy 배열로 보관
+    - 챔피언/포지션은 정수 코드 + 이름 사전
+    - is_me: 기준 puuid 의 행
+    """
+
+    def __init__(self, columns: dict[str, np.ndarray], champions: list[str], positions: list[str], games: int):
+        self.columns = columns
+        self.champions = champions
+        self.positions = positions
+        self.games = games
+
+    def __len__(self):
+        return len(self.columns["kills"])
+
+    @classmethod
+    def from_matches(cls, matches: list[dict], puuid: str | None = None) -> "ParticipantColumns":
+        """
+        :param matches: Riot 원본 MatchDto JSON dict 목록
+        """
+        champions = _Interner()
+        positions = _Interner()
+        raw = {name: [] for name, _, _ in _INT_COLUMNS}
+        raw.update(match=[], champion=[], position=[], win=[], is_me=[], minutes=[])
+
+        for index, match in enumerate(matches):
+            info = match.get("info") or {}
+            # gameDuration 은 초 단위 (아주 오래된 경기는 ms 단위)
+            duration = info.get("gameDuration") or 0
+            minutes = (duration / 60000 if duration > 100000 else duration / 60) or 1.0
+            for p in info.get("participants") or []:
+                raw["match"].append(index)
+                raw["champion"].append(champions(p.get("championName")))
+                raw["position"].append(positions(p.get("teamPosition")))
+                raw["win"].append(bool(p.get("win")))
+                raw["is_me"].append(puuid is not None and p.get("puuid") == puuid)
+                raw["minutes"].append(minutes)
+                for name, _, field in _INT_COLUMNS:
+                    raw[name].append(p.get(field) or 0)
+
+        columns = {name: np.asarray(raw[name], dtype=dtype) for name, dtype, _ in _INT_COLUMNS}
+        columns["match"] = np.asarray(raw["match"], dtype=np.int32)
+        columns["champion"] = np.asarray(raw["champion"], dtype=np.int32)
+        columns["position"] = np.asarray(raw["position"], dtype=np.int32)
+        columns["win"] = np.asarray(raw["win"], dtype=bool)
+        columns["is_me"] = np.asarray(raw["is_me"], dtype=bool)
+        columns["minutes"] = np.asarray(raw["minutes"], dtype=np.float32)
+
+        # 팀 전체 챔피언 피해량 (딜 비중 계산용): (경기, 팀) 별 합을 각 행에 다시 펼침
+        team_key = columns["match"].astype(np.int64) * 1000 + columns["team_id"]
+        keys, inverse = np.unique(team_key, return_inverse=True)
+        team_damage = np.bincount(inverse, weights=columns["damage"], minlength=len(keys))
+        columns["team_damage"] = team_damage[inverse] if len(inverse) else np.zeros(0)
+
+        return cls(columns, champions.names, positions.names, len(matches))
+
+
+def _stat_line(c: dict[str, np.ndarray], mask: np.ndarray) -> dict:
+    games = int(mask.sum())
+    if not games:
+        return {"games": 0}
+    kills = int(c["kills"][mask].sum())
+    deaths = int(c["deaths"][mask].sum())
+    assists = int(c["assists"][mask].sum())
+    cs = c["minions"][mask].astype(np.int64) + c["neutral"][mask]
+    team_damage = c["team_damage"][mask]
+    share = np.divide(c["damage"][mask], team_damage, out=np.zeros(games), where=team_damage > 0)
+    return {
+        "games": games,
+        "wins": int(c["win"][mask].sum()),
+        "winRate": round(float(c["win"][mask].mean()), 4),
+        "kills": round(kills / games, 2),
+        "deaths": round(deaths / games, 2),
+        "assists": round(assists / games, 2),
+        "kda": round((kills + assists) / max(deaths, 1), 2),
+        "csPerMin": round(float(cs.sum() / c["minutes"][mask].sum()), 2),
+        "damageShare": round(float(share.mean()), 4),
+        "goldPerMin": round(float(c["gold"][mask].sum() / c["minutes"][mask].sum()), 1),
+    }
+
+
+def summarize(cols: ParticipantColumns, mask: np.ndarray | None = None) -> dict:
+    """mask 에 해당하는 행 전체의 승률/KDA/CS 분당/딜 비중"""
+    if mask is None:
+        mask = np.ones(len(cols), dtype=bool)
+    return _stat_line(cols.columns, mask)
+
+
+def group_by(cols: ParticipantColumns, key: str, mask: np.ndarray | None = None, min_games: int = 1) -> list[dict]:
+    """
+    key("champion" / "position") 별 통계, 게임 수 내림차순
+    - bincount 로 그룹별 합계를 한 번에 계산
+    """
+    c = cols.columns
+    names = cols.champions if key == "champion" else cols.positions
+    if mask is None:
+        mask = np.ones(len(cols), dtype=bool)
+    codes = c[key][mask]
+    if not len(codes):
+        return []
+    size = len(names)
+
+    def total(column, dtype=np.float64):
+        return np.bincount(codes, weights=c[column][mask].astype(dtype), minlength=size)
+
+    games = np.bincount(codes, minlength=size)
+    wins = total("win")
+    kills, deaths, assists = total("kills"), total("deaths"), total("assists")
+    cs = total("minions") + total("neutral")
+    minutes = total("minutes")
+    gold = total("gold")
+    team_damage = c["team_damage"][mask]
+    share = np.divide(c["damage"][mask], team_damage, out=np.zeros(len(codes)), where=team_damage > 0)
+    share_total = np.bincount(codes, weights=share, minlength=size)
+
+    result = []
+    for code in np.argsort(-games, kind="stable"):
+        n = int(games[code])
+        if n < min_games:
+            continue
+        result.append({
+            "name": names[code] or "UNKNOWN",
+            "games": n,
+            "wins": int(wins[code]),
+            "winRate": round(float(wins[code] / n), 4),
+            "kills": round(float(kills[code] / n), 2),
+            "deaths": round(float(deaths[code] / n), 2),
+            "assists": round(float(assists[code] / n), 2),
+            "kda": round(float((kills[code] + assists[code]) / max(deaths[code], 1)), 2),
+            "csPerMin": round(float(cs[code] / minutes[code]), 2),
+            "damageShare": round(float(share_total[code] / n), 4),
+            "goldPerMin": round(float(gold[code] / minutes[code]), 1),
+        })
+    return result